@@ -2,31 +2,34 @@
 Centralized configuration for watermark and defaults.
 """
 
+from typing import NamedTuple, Tuple
 
-class WatermarkConfig:
-    """Watermark-related configuration constants"""
+
+class WatermarkConfig(NamedTuple):
+    """Watermark-related configuration (immutable; read it through CONFIG)"""
     # Whether to automatically generate image watermark from text
-    GENERATE_IMAGE_FROM_TEXT = True
+    generate_image_from_text: bool = True
 
     # Generated text watermark image filename
-    TEXT_WATERMARK_FILE = "watermarks/text_watermark.png"
+    text_watermark_file: str = "watermarks/text_watermark.png"
 
     # Text watermark generation parameters
-    FONT_SIZE = 36
-    TEXT_COLOR = (68, 68, 68, 220)
-    PADDING = 20
+    font_size: int = 36
+    text_color: Tuple[int, int, int, int] = (68, 68, 68, 220)
+    padding: int = 20
 
     # PDF watermark parameters
-    WATERMARK_TYPE = "grid"
-    OPACITY = 0.2
-    ANGLE = 45
-    IMAGE_SCALE = 1.0
-    HORIZONTAL_BOXES = 3
-    VERTICAL_BOXES = 6
-
+    watermark_type: str = "grid"
+    opacity: float = 0.2
+    angle: float = 45
+    image_scale: float = 1.0
+    horizontal_boxes: int = 3
+    vertical_boxes: int = 6
 
-# Backward compatibility constants
-GENERATE_IMAGE_FROM_TEXT = WatermarkConfig.GENERATE_IMAGE_FROM_TEXT
-TEXT_WATERMARK_FILE = WatermarkConfig.TEXT_WATERMARK_FILE
 
+# Shared configuration instance
+CONFIG = WatermarkConfig()
 
+# Backward compatibility constants
+GENERATE_IMAGE_FROM_TEXT = CONFIG.generate_image_from_text
+TEXT_WATERMARK_FILE = CONFIG.text_watermark_file
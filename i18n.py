@@ -4,79 +4,161 @@ Internationalization support module
 Supports English and Chinese languages, automatically selects based on system language
 """
 
+import functools
 import locale
 import os
-from typing import Dict, Any
+import sys
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
 
 try:
-    # Load translations from locales modules to reduce function length
-    from locales.en import EN  # type: ignore
-    from locales.zh import ZH  # type: ignore
-except Exception:
-    EN, ZH = {}, {}
+    # orjson parses in C; fall back to the stdlib parser when not installed
+    from orjson import loads as _json_loads  # type: ignore
+except ImportError:
+    from json import loads as _json_loads
+
+from locales import LANGUAGES, NAMESPACES
+
+_LOCALES_DIR = Path(__file__).resolve().parent / 'locales'
+
+
+def _load_ns(lang: str, ns: str) -> Dict[str, str]:
+    """Load one translation namespace (e.g. locales/en/menu.json) on demand."""
+    translations = _json_loads((_LOCALES_DIR / lang / f'{ns}.json').read_bytes())
+    # Intern keys so lookups with literal keys hit the identity fast path
+    return {sys.intern(k): v for k, v in translations.items()}
+
+
+@functools.lru_cache(maxsize=1)
+def _legacy_key_namespaces() -> Dict[str, str]:
+    """Map unprefixed keys to their namespace, built from the catalogs (all languages share keys)."""
+    return {key: ns for ns in NAMESPACES for key in _load_ns(LANGUAGES[0], ns)}
+
+
+def _split_key(key: str) -> Tuple[str, str]:
+    """Split 'menu.app_title' into ('menu', 'app_title'); resolve legacy unprefixed keys."""
+    ns, _, name = key.partition('.')
+    if name and ns in NAMESPACES:
+        return ns, name
+    # Legacy shim: only unprefixed keys pay for loading every namespace
+    return _legacy_key_namespaces().get(key, ''), key
+
+
+class _FormatArgs(dict):
+    """format_map mapping that leaves unknown placeholders as-is instead of raising."""
+
+    def __missing__(self, key: str) -> str:
+        return '{' + key + '}'
+
+
+_ZH_PREFIXES = ('zh', 'chinese')
+_EN_PREFIXES = ('en', 'english')
+
+
+def _match_language(value: str) -> str:
+    """Map a locale string (e.g. 'zh_CN.UTF-8') to a supported language code."""
+    value = value.lower()
+    if value.startswith(_ZH_PREFIXES):
+        return 'zh'
+    if value.startswith(_EN_PREFIXES):
+        return 'en'
+    return ''
+
+
+@functools.lru_cache(maxsize=1)
+def _detect_system_language() -> str:
+    """Detect system language (computed once per process)"""
+    # Environment variables first: a cheap string check on Linux/macOS
+    env_lang = os.environ.get('LC_ALL') or os.environ.get('LANG') or ''
+    if env_lang:
+        return _match_language(env_lang) or 'en'
+
+    # Only query the locale subsystem when no env var is set (e.g. Windows)
+    try:
+        system_lang = locale.getlocale()[0]
+        if system_lang:
+            return _match_language(system_lang) or 'en'
+    except Exception:
+        pass
+
+    # Default to English
+    return 'en'
 
 
 class I18n:
     """Internationalization class, manages multi-language support"""
     
     def __init__(self):
-        self.current_language = self._detect_system_language()
-        self.translations = self._load_translations()
-    
-    def _detect_system_language(self) -> str:
-        """Detect system language"""
-        try:
-            # Get system language environment
-            system_lang = locale.getdefaultlocale()[0]
-            if system_lang:
-                # Extract language code (e.g., 'zh_CN' -> 'zh')
-                lang_code = system_lang.split('_')[0].lower()
-                if lang_code in ['zh', 'chinese']:
-                    return 'zh'
-                elif lang_code in ['en', 'english']:
-                    return 'en'
-            
-            # Check environment variables
-            env_lang = os.environ.get('LANG', '').lower()
-            if 'zh' in env_lang:
-                return 'zh'
-            elif 'en' in env_lang:
-                return 'en'
-                
-        except Exception:
-            pass
-        
-        # Default to English
-        return 'en'
+        self.current_language = sys.intern(_detect_system_language())
+        self._cache: Dict[Tuple[str, str], Dict[str, str]] = {}
+        # Flat key -> (text, has_placeholders) table for the current language only
+        self._active: Dict[str, Tuple[str, bool]] = {}
+
+    def _namespace(self, lang: str, ns: str) -> Dict[str, str]:
+        """Get one namespace dict for a language, loading it once."""
+        translations = self._cache.get((lang, ns))
+        if translations is None:
+            translations = self._cache.setdefault((lang, ns), _load_ns(lang, ns))
+        return translations
     
-    def _load_translations(self) -> Dict[str, Dict[str, str]]:
-        """Load translations from locales modules."""
-        return {'en': EN, 'zh': ZH}
+    def _resolve(self, key: str) -> str:
+        """Look up a key in its namespace for the current language."""
+        ns, name = _split_key(key)
+        return self._namespace(self.current_language, ns).get(name, key) if ns else key
     
     def t(self, key: str, **kwargs) -> str:
-        """Get translated text"""
-        text = self.translations.get(self.current_language, {}).get(key, key)
-        if kwargs:
-            try:
-                return text.format(**kwargs)
-            except (KeyError, ValueError):
-                return text
+        """
+        Get translated text.
+
+        Pass keys as string literals: they are interned by the compiler, as are
+        the table keys, so dict probes compare by identity.
+        """
+        entry = self._active.get(key)
+        if entry is None:
+            text = self._resolve(key)
+            entry = self._active[sys.intern(key)] = (text, '{' in text)
+        text, has_fmt = entry
+        if kwargs and has_fmt:
+            # Only the template lookup is cached; formatted calls mostly carry one-off
+            # values (file names, errors), and those need not be hashable
+            return text.format_map(_FormatArgs(kwargs))
         return text
     
     def set_language(self, language: str):
         """Set language"""
-        if language in self.translations:
-            self.current_language = language
+        if language in LANGUAGES and language != self.current_language:
+            # Only the active language stays resident; the previous one is dropped
+            # and would be reloaded on demand if the user switches back.
+            previous = self.current_language
+            self._cache = {k: v for k, v in self._cache.items() if k[0] != previous}
+            self.current_language = sys.intern(language)
+            self._active = {}
     
     def get_current_language(self) -> str:
         """Get current language"""
         return self.current_language
 
 
-# Global internationalization instance
-i18n = I18n()
+# Global internationalization instance, created on first use
+_instance: Optional[I18n] = None
+
+
+def get_i18n() -> I18n:
+    """Return the global I18n instance, creating it on first call"""
+    global _instance
+    if _instance is None:
+        _instance = I18n()
+    return _instance
+
+
+def __getattr__(name: str) -> Any:
+    # PEP 562: keep `from i18n import i18n` working without eager construction
+    if name == 'i18n':
+        return get_i18n()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Convenience function
 def t(key: str, **kwargs) -> str:
     """Convenience function to get translated text"""
-    return i18n.t(key, **kwargs)
+    return (_instance or get_i18n()).t(key, **kwargs)
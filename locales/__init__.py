@@ -0,0 +1,6 @@
+"""
+Translation catalogs: locales/<lang>/<namespace>.json, loaded lazily by i18n.
+"""
+
+LANGUAGES = ('en', 'zh')
+NAMESPACES = ('menu', 'process', 'errors', 'config')
@@ -1,94 +0,0 @@
-EN: dict = {
-    # Main menu
-    'app_title': 'Markdown to PDF Tool',
-    'select_operation_mode': 'Please select operation mode:',
-    'operation_mode_title': '1. Operation Mode Selection:',
-    'process_pdf_with_watermark': 'Process PDF files (add watermark)',
-    'convert_md_to_pdf_with_watermark': 'Convert Markdown to PDF (add watermark)',
-    'generate_watermark_only': 'Generate watermark image only',
-    'convert_md_to_pdf_no_watermark': 'Convert Markdown to PDF (no watermark)',
-    'exit_program': 'Exit program',
-    'invalid_choice': 'Invalid choice, please enter',
-    'watermark_type_title': '2. Watermark Type Selection:',
-    'text_watermark_recommended': 'Text watermark (recommended)',
-    'image_watermark': 'Image watermark',
-    'back_to_previous': 'Back to previous',
-    'text_watermark_config': '3. Text Watermark Configuration:',
-    'image_watermark_config': '3. Image Watermark Configuration:',
-    'enter_watermark_text': 'Please enter watermark text:',
-    'watermark_text_cannot_be_empty': 'Watermark text cannot be empty, please re-enter',
-    'add_date_to_watermark': 'Add date to watermark text? (y/n, default: y):',
-    'enter_watermark_image_path': 'Please enter watermark image path:',
-    'image_file_not_found': 'Image file not found:',
-    'image_path_cannot_be_empty': 'Image path cannot be empty',
-    'enter_y_n_or_0': 'Please enter y, n or 0 to go back',
-
-    # Processing
-    'start_generating_watermark': 'Start generating watermark image...',
-    'start_converting_md_no_watermark': 'Start converting Markdown to PDF (no watermark)...',
-    'start_processing_files': 'Start processing files...',
-    'watermark_mode': 'Watermark mode',
-    'input_directory': 'Input directory',
-    'output_directory': 'Output directory',
-    'watermark_image': 'Watermark image',
-    'text_watermark_generated': 'Text watermark image generated:',
-    'using_font': 'Using font:',
-    'watermark_generation_completed': 'Watermark generation completed!',
-    'watermark_image_generated': 'Watermark image generated:',
-    'no_pdf_found_processing_md': 'No PDF found, will process Markdown and convert to PDF (Mermaid) and add watermark',
-    'found_md_files': 'Found {count} Markdown files (Mermaid support)',
-    'conversion_successful': 'Conversion successful: {input_file} -> {output_file}',
-    'conversion_failed': 'Conversion failed: {file}',
-    'conversion_failed_with_error': 'Conversion failed: {file} - {error}',
-    'no_md_files_converted': 'No Markdown files converted successfully',
-    'md_conversion_completed': 'Markdown conversion completed: {success}/{total} successful',
-    'processing_pdf_files': 'Processing PDF files...',
-    'processing_md_files': 'Processing Markdown files...',
-    'pdf_processing_completed': 'PDF processing completed: {success}/{total} successful',
-    'no_pdf_files_processed': 'No PDF files processed successfully',
-    'found_pdf_files': 'Found {count} PDF files',
-    'processing_successful': 'Processing successful: {src} -> {dst}',
-    'processing_failed': 'Processing failed: {file}',
-    'processing_failed_with_error': 'Processing failed: {file} - {error}',
-
-    # Errors
-    'watermark_image_not_found': 'Watermark image not found and text to image conversion failed',
-    'no_md_files_in_directory': 'No Markdown files found in {directory} directory',
-    'no_pdf_files_in_directory': 'No PDF files found in {directory} directory',
-    'detected_non_interactive': 'Detected non-interactive environment, using default configuration...',
-    'hint_interactive_mode': "Hint: Use 'python main.py --interactive' to enter interactive mode",
-    'program_exited': 'Program exited',
-    'missing_dependency_pillow': "Missing dependency: pillow. Please run: pip install pillow",
-    'missing_dependency_markdown': "Missing dependency: markdown. Please run: pip install markdown",
-    'missing_dependency_playwright': "Missing dependency: playwright. Please run: pip install playwright && playwright install",
-    'chinese_font_not_found': 'No suitable CJK font found. Set WATERMARK_FONT to a local *.ttf/*.ttc or install a CJK font.',
-    'open_font_failed': 'Failed to open font: {font} - {error}',
-    'text_watermark_image_generated': 'Text watermark image generated: {path} Using font: {font}',
-    'watermark_cli_not_found': 'Watermark CLI tool not found',
-    'install_pdf_watermark_hint': 'Please install pdf-watermark:\n  pip install pdf-watermark',
-    'watermark_cli_available': 'Watermark CLI tool available',
-    'input_directory_not_exists': 'Input directory does not exist: {directory}',
-
-    # Config labels
-    'watermark_type': 'Watermark type',
-    'watermark_text': 'Watermark text',
-    'watermark_image_path': 'Watermark image path',
-    'add_date': 'Add date',
-    'font_size': 'Font size',
-    'text_color': 'Text color',
-    'padding': 'Padding',
-    'watermark_layout': 'Watermark layout',
-    'opacity': 'Opacity',
-    'rotation_angle': 'Rotation angle',
-    'image_scale': 'Image scale',
-    'horizontal_boxes': 'Horizontal boxes',
-    'vertical_boxes': 'Vertical boxes',
-    'input_dir': 'Input directory',
-    'output_dir': 'Output directory',
-    'verbose_output': 'Verbose output',
-    'default': 'Default',
-    'yes': 'Yes',
-    'no': 'No',
-}
-
-
@@ -1,94 +0,0 @@
-ZH: dict = {
-    # 主菜单
-    'app_title': 'Markdown转PDF工具',
-    'select_operation_mode': '请选择操作模式：',
-    'operation_mode_title': '1. 操作模式选择：',
-    'process_pdf_with_watermark': '处理PDF文件（添加水印）',
-    'convert_md_to_pdf_with_watermark': '转换Markdown到PDF（添加水印）',
-    'generate_watermark_only': '仅生成图片水印',
-    'convert_md_to_pdf_no_watermark': '转换Markdown到PDF（无水印）',
-    'exit_program': '退出程序',
-    'invalid_choice': '无效选择，请输入',
-    'watermark_type_title': '2. 水印类型选择：',
-    'text_watermark_recommended': '文本水印（推荐）',
-    'image_watermark': '图片水印',
-    'back_to_previous': '返回上一级',
-    'text_watermark_config': '3. 文本水印配置：',
-    'image_watermark_config': '3. 图片水印配置：',
-    'enter_watermark_text': '请输入水印文本：',
-    'watermark_text_cannot_be_empty': '水印文本不能为空，请重新输入',
-    'add_date_to_watermark': '是否添加日期到水印文本？(y/n，默认: y)：',
-    'enter_watermark_image_path': '请输入水印图片路径：',
-    'image_file_not_found': '图片文件不存在：',
-    'image_path_cannot_be_empty': '图片路径不能为空',
-    'enter_y_n_or_0': '请输入 y、n 或 0 返回上一级',
-
-    # 处理过程
-    'start_generating_watermark': '开始生成水印图片...',
-    'start_converting_md_no_watermark': '开始转换Markdown到PDF（无水印）...',
-    'start_processing_files': '开始处理文件...',
-    'watermark_mode': '水印模式',
-    'input_directory': '输入目录',
-    'output_directory': '输出目录',
-    'watermark_image': '水印图片',
-    'text_watermark_generated': '文本水印图片已生成：',
-    'using_font': '使用字体：',
-    'watermark_generation_completed': '水印生成完成！',
-    'watermark_image_generated': '水印图片已生成：',
-    'no_pdf_found_processing_md': '未找到PDF，将处理Markdown并转换为PDF (Mermaid) 并添加水印',
-    'found_md_files': '找到 {count} 个Markdown文件 (Mermaid支持)',
-    'conversion_successful': '转换成功：{input_file} -> {output_file}',
-    'conversion_failed': '转换失败：{file}',
-    'conversion_failed_with_error': '转换失败：{file} - {error}',
-    'no_md_files_converted': '没有成功转换任何Markdown文件',
-    'md_conversion_completed': 'Markdown转换完成：{success}/{total} 成功',
-    'processing_pdf_files': '处理PDF文件...',
-    'processing_md_files': '处理Markdown文件...',
-    'pdf_processing_completed': 'PDF处理完成：{success}/{total} 成功',
-    'no_pdf_files_processed': '没有成功处理任何PDF文件',
-    'found_pdf_files': '找到 {count} 个PDF文件',
-    'processing_successful': '成功处理：{src} -> {dst}',
-    'processing_failed': '处理失败：{file}',
-    'processing_failed_with_error': '处理失败：{file} - {error}',
-
-    # 错误信息
-    'watermark_image_not_found': '未找到图片水印，且文本转图片失败',
-    'no_md_files_in_directory': '在 {directory} 目录中未找到Markdown文件',
-    'no_pdf_files_in_directory': '在 {directory} 目录中未找到PDF文件',
-    'detected_non_interactive': '检测到非交互式环境，使用默认配置...',
-    'hint_interactive_mode': "提示：使用 'python main.py --interactive' 进入交互式模式",
-    'program_exited': '程序已退出',
-    'missing_dependency_pillow': '缺少依赖: pillow。请先运行: pip install pillow',
-    'missing_dependency_markdown': '缺少依赖: markdown。请先运行: pip install markdown',
-    'missing_dependency_playwright': '缺少依赖: playwright。请先运行: pip install playwright && playwright install',
-    'chinese_font_not_found': '未找到可用中文字体。请设置环境变量 WATERMARK_FONT 指向本地 *.ttf/*.ttc，或安装中文字体。',
-    'open_font_failed': '打开字体失败: {font} - {error}',
-    'text_watermark_image_generated': '文本水印图片已生成: {path} 使用字体: {font}',
-    'watermark_cli_not_found': 'Watermark CLI工具未找到',
-    'install_pdf_watermark_hint': '请先安装pdf-watermark:\n  pip install pdf-watermark',
-    'watermark_cli_available': 'Watermark CLI工具可用',
-    'input_directory_not_exists': '输入目录不存在: {directory}',
-
-    # 水印配置
-    'watermark_type': '水印类型',
-    'watermark_text': '水印文本',
-    'watermark_image_path': '水印图片路径',
-    'add_date': '添加日期',
-    'font_size': '字体大小',
-    'text_color': '文本颜色',
-    'padding': '内边距',
-    'watermark_layout': '水印布局',
-    'opacity': '透明度',
-    'rotation_angle': '旋转角度',
-    'image_scale': '图片缩放',
-    'horizontal_boxes': '水平网格数',
-    'vertical_boxes': '垂直网格数',
-    'input_dir': '输入目录',
-    'output_dir': '输出目录',
-    'verbose_output': '详细输出',
-    'default': '默认',
-    'yes': '是',
-    'no': '否',
-}
-
-
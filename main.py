@@ -5,20 +5,30 @@ Add watermarks to all PDF files in the input directory and output to the output
 Also supports converting Markdown(.md) files in the input directory to Mermaid-supported PDF and output to the output directory.
 """
 
+import contextlib
+import functools
+import hashlib
+import html
+import io
+import json
 import os
-import subprocess
+import re
+import shutil
 import sys
+import tempfile
+import time
 from pathlib import Path
-from typing import List, Optional
-from datetime import date, datetime
-import json
+from types import MappingProxyType
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple, Union
 
 # Import internationalization support
-from i18n import t, i18n
-from config import WatermarkConfig, GENERATE_IMAGE_FROM_TEXT, TEXT_WATERMARK_FILE
+from i18n import t, get_i18n
+from config import CONFIG, GENERATE_IMAGE_FROM_TEXT, TEXT_WATERMARK_FILE
 from ui.input_flow import get_user_input
 from watermark.image_setup import (
+    TEXT_WATERMARK_CACHE_DIR,
     _setup_watermark_image,
+    prune_text_watermark_cache,
     find_watermark_image,
     generate_text_watermark_image,
     get_today_str,
@@ -26,10 +36,49 @@ from watermark.image_setup import (
 
 # ========= Configuration Constants =========
 
+# Input file extensions (matched case-insensitively)
+PDF_SUFFIXES = (".pdf",)
+MD_SUFFIXES = (".md", ".markdown")
+
+# Upper bound on Markdown files rendered concurrently in the shared browser
+MAX_BROWSER_WORKERS = 4
+# Separator line used by banners and summaries
+_SEP = "=" * 50
+
 
 # get_user_input is now imported from ui.input_flow
 
 
+# Resolved watermark CLI path, cached after the first successful lookup
+_WATERMARK_CMD: Optional[str] = None
+
+
+def _resolve_watermark_cmd() -> Optional[str]:
+    """
+    Locate the watermark CLI once and cache its path.
+    
+    Returns:
+        Optional[str]: Full path of the watermark command, or None if not found
+    """
+    global _WATERMARK_CMD
+    if _WATERMARK_CMD:
+        return _WATERMARK_CMD
+    # Try different watermark command names in PATH
+    for cmd in ("watermark", "pdf-watermark"):
+        path = shutil.which(cmd)
+        if path:
+            _WATERMARK_CMD = path
+            return path
+    # Console script next to the interpreter (virtual environment that isn't activated)
+    exe_name = "watermark.exe" if os.name == "nt" else "watermark"
+    for scripts_dir in (Path(sys.executable).parent, Path(sys.executable).parent / "Scripts"):
+        candidate = scripts_dir / exe_name
+        if candidate.is_file():
+            _WATERMARK_CMD = str(candidate)
+            return _WATERMARK_CMD
+    return None
+
+
 def run_watermark_command(args: List[str]) -> tuple:
     """
     Run watermark CLI command and return results.
@@ -38,42 +87,130 @@ def run_watermark_command(args: List[str]) -> tuple:
         args: List of arguments for watermark command
         
     Returns:
-        tuple: (stdout, stderr, return_code) Command execution results
+        tuple: (stdout, stderr, return_code) Command execution results; stdout is
+            discarded (always "") since only errors are reported
     """
-    # Try different watermark command paths
-    watermark_commands = [
-        "watermark",  # Command in system PATH
-        "pdf-watermark",  # Alternative command name
-        sys.executable.replace("python", "watermark"),  # Command in virtual environment
-    ]
+    cmd = _resolve_watermark_cmd()
+    if not cmd:
+        return "", "watermark command not found", 1
+    import subprocess  # Only needed when pdf-watermark is used as a CLI
+
+    result = subprocess.run(
+        [cmd] + args,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    return "", result.stderr, result.returncode
+
+
+@functools.lru_cache(maxsize=1)
+def _load_watermark_api() -> Optional[tuple]:
+    """
+    Import the pdf-watermark library for in-process use.
     
-    for cmd in watermark_commands:
-        try:
-            result = subprocess.run(
-                [cmd] + args,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return result.stdout, result.stderr, 0
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            continue
+    Returns:
+        Optional[tuple]: (add_watermark_to_pdf, DrawingOptions, GridOptions, InsertOptions),
+        or None if the library cannot be imported or its option classes don't match the
+        keywords _watermark_options passes (e.g. pdf-watermark 2.x); the CLI is used then
+    """
+    try:
+        from pdf_watermark.handler import add_watermark_to_pdf  # type: ignore
+        from pdf_watermark.options import DrawingOptions, GridOptions, InsertOptions  # type: ignore
+    except Exception:
+        return None
+    option_classes = ((DrawingOptions, _DRAWING_OPTION_NAMES), (GridOptions, _GRID_OPTION_NAMES),
+                      (InsertOptions, _INSERT_OPTION_NAMES))
+    if not all(_accepts_exactly(cls, names) for cls, names in option_classes):
+        return None
+    return add_watermark_to_pdf, DrawingOptions, GridOptions, InsertOptions
+
+
+# Keywords _watermark_options passes to the pdf-watermark option dataclasses
+_DRAWING_OPTION_NAMES = frozenset(("watermark", "opacity", "angle", "image_scale", "unselectable", "save_as_image"))
+_GRID_OPTION_NAMES = frozenset(("horizontal_boxes", "vertical_boxes", "margin"))
+_INSERT_OPTION_NAMES = frozenset(("x", "y", "horizontal_alignment"))
+
+
+def _accepts_exactly(cls, names: frozenset) -> bool:
+    """
+    Check that a dataclass accepts the given keywords and has defaults for all other fields.
     
-    return "", "watermark command not found", 1
+    Args:
+        cls: Dataclass to inspect
+        names: Keyword names that will be passed
+        
+    Returns:
+        bool: True if cls(**{name: ...}) can be constructed
+    """
+    import dataclasses
+
+    if not dataclasses.is_dataclass(cls):
+        return False
+    fields = [f for f in dataclasses.fields(cls) if f.init]
+    required = {f.name for f in fields
+                if f.default is dataclasses.MISSING and f.default_factory is dataclasses.MISSING}
+    return required <= names <= {f.name for f in fields}
 
 
 def check_watermark_tool() -> bool:
     """
-    Check if watermark tool is available.
+    Check if watermark tool is available (library or CLI).
     
     Returns:
         bool: True if watermark tool is available, False otherwise
     """
+    return _load_watermark_api() is not None or _resolve_watermark_cmd() is not None
+
+
+def _list_files_with_suffix(input_dir: Path, suffixes: Tuple[str, ...]) -> List[Path]:
+    """
+    List files in a directory whose extension matches, in a single scandir pass.
+    
+    Args:
+        input_dir: Directory to scan (non-recursive)
+        suffixes: Lower-case extensions to accept, e.g. (".pdf",)
+        
+    Returns:
+        List[Path]: Sorted list of matching file paths
+    """
     try:
-        subprocess.run(["watermark", "--help"], capture_output=True, text=True, check=True)
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
+        with os.scandir(input_dir) as entries:
+            return sorted(Path(e.path) for e in entries if e.name.lower().endswith(suffixes) and e.is_file())
+    except (FileNotFoundError, NotADirectoryError):
+        # Same as the old glob-based lookup: a missing directory (or a file) has no files
+        return []
+
+
+def _scan_inputs(input_dir: Path) -> Tuple[List[Path], List[Path]]:
+    """
+    Classify the PDF and Markdown files of a directory in one scandir pass.
+    
+    Args:
+        input_dir: Directory to scan (non-recursive)
+        
+    Returns:
+        Tuple[List[Path], List[Path]]: Sorted (PDF files, Markdown files)
+    """
+    pdf_files: List[Path] = []
+    md_files: List[Path] = []
+    try:
+        with os.scandir(input_dir) as entries:
+            for e in entries:
+                name = e.name.lower()
+                if name.endswith(PDF_SUFFIXES):
+                    bucket = pdf_files
+                elif name.endswith(MD_SUFFIXES):
+                    bucket = md_files
+                else:
+                    continue
+                if e.is_file():
+                    bucket.append(Path(e.path))
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    pdf_files.sort()
+    md_files.sort()
+    return pdf_files, md_files
 
 
 def get_pdf_files(input_dir: Path) -> List[Path]:
@@ -86,10 +223,7 @@ def get_pdf_files(input_dir: Path) -> List[Path]:
     Returns:
         List[Path]: Sorted list of PDF file paths
     """
-    pdf_files: List[Path] = []
-    for pattern in ["*.pdf", "*.PDF"]:
-        pdf_files.extend(input_dir.glob(pattern))
-    return sorted(pdf_files)
+    return _list_files_with_suffix(input_dir, PDF_SUFFIXES)
 
 
 # find_watermark_image moved to watermark.image_setup
@@ -136,11 +270,166 @@ def add_watermark_to_file(
     Returns:
         bool: True if succeeded, False otherwise
     """
+    ok, error = _apply_watermark(input_file, output_file, watermark_image,
+                                 watermark_type, opacity, angle, image_scale, **kwargs)
+    return _report_watermark_result(input_file, output_file, ok, error)
+
+
+def _report_watermark_result(input_file: Path, output_file: Path, ok: bool, error: str) -> bool:
+    """Print the outcome of watermarking one file and return ok."""
+    if not ok:
+        print("✗ " + t('process.processing_failed_with_error', file=input_file.name, error=error))
+        return False
+    print("✓ " + t('process.processing_successful', src=input_file.name, dst=output_file.name))
+    return True
+
+
+def _apply_watermark(
+    source: Union[Path, BinaryIO],
+    output_file: Path,
+    watermark_image: str,
+    watermark_type: str = "grid",
+    opacity: float = 0.2,
+    angle: float = 45,
+    image_scale: float = 1.0,
+    **kwargs
+) -> Tuple[bool, str]:
+    """
+    Watermark a PDF given as a path or an in-memory stream, using the library if available.
+    
+    Returns:
+        Tuple[bool, str]: (success, error message)
+    """
+    api = _load_watermark_api()
+    if api is not None:
+        return _watermark_in_process(api, source, output_file, watermark_image,
+                                     watermark_type, opacity, angle, image_scale, **kwargs)
+    if isinstance(source, Path):
+        return _watermark_with_cli(source, output_file, watermark_image,
+                                   watermark_type, opacity, angle, image_scale, **kwargs)
+    # The CLI only reads files: spill the in-memory PDF to a temporary file
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+        tmp.write(source.read())
+    try:
+        return _watermark_with_cli(Path(tmp.name), output_file, watermark_image,
+                                   watermark_type, opacity, angle, image_scale, **kwargs)
+    finally:
+        try:
+            os.unlink(tmp.name)
+        except OSError:
+            pass
+
+
+@functools.lru_cache(maxsize=8)
+def _watermark_options(
+    watermark_image: str,
+    watermark_type: str,
+    opacity: float,
+    angle: float,
+    image_scale: float,
+    options: Tuple[Tuple[str, object], ...],
+) -> tuple:
+    """
+    Build the pdf-watermark option objects once per distinct configuration.
+    
+    DrawingOptions decodes the watermark image when constructed, so a batch shares one
+    instance instead of decoding it again for every PDF.
+    
+    Returns:
+        tuple: (DrawingOptions, GridOptions or InsertOptions)
+    """
+    _, DrawingOptions, GridOptions, InsertOptions = _load_watermark_api()
+    kwargs = dict(options)
+    drawing_options = DrawingOptions(
+        watermark=watermark_image,
+        opacity=opacity,
+        angle=angle,
+        image_scale=image_scale,
+        unselectable=kwargs.get("unselectable", False),
+        save_as_image=kwargs.get("save_as_image", False),
+    )
+    if watermark_type == "insert":
+        specific_options = InsertOptions(
+            x=kwargs.get("x", 0.5),
+            y=kwargs.get("y", 0.5),
+            horizontal_alignment=kwargs.get("horizontal_alignment", "center"),
+        )
+    else:
+        specific_options = GridOptions(
+            horizontal_boxes=kwargs.get("horizontal_boxes", 3),
+            vertical_boxes=kwargs.get("vertical_boxes", 6),
+            margin=kwargs.get("margin", False),
+        )
+    return drawing_options, specific_options
+
+
+def _watermark_in_process(
+    api: tuple,
+    input_file: Union[Path, BinaryIO],
+    output_file: Path,
+    watermark_image: str,
+    watermark_type: str,
+    opacity: float,
+    angle: float,
+    image_scale: float,
+    **kwargs
+) -> Tuple[bool, str]:
+    """Watermark one PDF by calling the pdf-watermark library directly (no process spawn)."""
+    add_watermark_to_pdf = api[0]
+    try:
+        drawing_options, specific_options = _watermark_options(
+            watermark_image, watermark_type, opacity, angle, image_scale, tuple(sorted(kwargs.items()))
+        )
+        # pypdf reads paths and file-like objects alike
+        add_watermark_to_pdf(input_file, str(output_file), drawing_options, specific_options)
+    except Exception as e:
+        return False, str(e)
+    return True, ""
+
+
+def _watermark_with_cli(
+    input_file: Path,
+    output_file: Path,
+    watermark_image: str,
+    watermark_type: str,
+    opacity: float,
+    angle: float,
+    image_scale: float,
+    **kwargs
+) -> Tuple[bool, str]:
+    """Watermark one PDF by running the watermark CLI."""
+    args = _watermark_cli_args(input_file, output_file, watermark_image,
+                               watermark_type, opacity, angle, image_scale, **kwargs)
+    stdout, stderr, return_code = run_watermark_command(args)
+    return return_code == 0, stderr
+
+
+def _watermark_cli_args(
+    source: Path,
+    output: Path,
+    watermark_image: str,
+    watermark_type: str,
+    opacity: float,
+    angle: float,
+    image_scale: float,
+    **kwargs
+) -> List[str]:
+    """Build watermark CLI arguments; source/output may be a file or a directory."""
+    options = _watermark_cli_options(watermark_type, opacity, angle, image_scale, tuple(sorted(kwargs.items())))
+    return [watermark_type, str(source), watermark_image, "-s", str(output), *options]
+
+
+@functools.lru_cache(maxsize=8)
+def _watermark_cli_options(
+    watermark_type: str,
+    opacity: float,
+    angle: float,
+    image_scale: float,
+    options: Tuple[Tuple[str, object], ...],
+) -> Tuple[str, ...]:
+    """Build the per-batch CLI option flags once; only input/output differ per file."""
+    kwargs = dict(options)
     args = [
-        watermark_type,
-        str(input_file),
-        watermark_image,
-        "-s", str(output_file),
         "-o", str(opacity),
         "-a", str(angle),
         "-is", str(image_scale),
@@ -156,13 +445,218 @@ def add_watermark_to_file(
         args.append("--unselectable")
     if kwargs.get("save_as_image", False):
         args.append("--save-as-image")
+    return tuple(args)
 
-    stdout, stderr, return_code = run_watermark_command(args)
-    if return_code != 0:
-        print("✗ " + t('processing_failed_with_error', file=input_file.name, error=stderr))
+
+def _cli_takes_directory(directory: Path, pdf_files: List[Path], output_path: Path) -> bool:
+    """
+    Check whether the watermark CLI, given a directory, would process exactly pdf_files.
+    
+    The CLI recurses into subdirectories and picks every file ending in .pdf or .PDF.
+    
+    Args:
+        directory: Candidate input directory
+        pdf_files: PDF files that need watermarking
+        output_path: Output directory
+        
+    Returns:
+        bool: True if the directory can be passed to the CLI as is
+    """
+    if any(pdf_file.parent != directory for pdf_file in pdf_files):
         return False
-    print("✓ " + t('processing_successful', src=input_file.name, dst=output_file.name))
-    return True
+    if directory.resolve() == output_path.resolve():
+        return False
+    names = set()
+    try:
+        with os.scandir(directory) as entries:
+            for e in entries:
+                if e.is_dir():
+                    return False
+                if e.name.endswith((".pdf", ".PDF")):
+                    names.add(e.name)
+    except OSError:
+        return False
+    return names == {pdf_file.name for pdf_file in pdf_files}
+
+
+def _watermark_batch_with_cli(
+    pdf_files: List[Path],
+    output_path: Path,
+    watermark_image: str,
+    watermark_type: str = "grid",
+    opacity: float = 0.2,
+    angle: float = 45,
+    image_scale: float = 1.0,
+    workers: int = 1,
+    **kwargs
+) -> List[Path]:
+    """
+    Watermark several PDFs with a single watermark CLI process.
+    
+    The CLI takes a directory: the input directory itself when it holds exactly these
+    files, otherwise the files are staged (hard-linked, or copied where links are not
+    possible) into a temporary directory next to them and processed in one run.
+    
+    Args:
+        pdf_files: Input PDF file paths
+        output_path: Output directory
+        watermark_image: Watermark image path
+        watermark_type: Watermark type, default "grid"
+        opacity: Opacity, default 0.2
+        angle: Rotation angle in degrees, default 45
+        image_scale: Image scale, default 1.0
+        workers: Number of worker processes the CLI may use
+        **kwargs: Additional parameters such as horizontal_boxes, vertical_boxes
+        
+    Returns:
+        List[Path]: Input files that were watermarked successfully
+    """
+    source_dir = pdf_files[0].parent
+    with contextlib.ExitStack() as stack:
+        if not _cli_takes_directory(source_dir, pdf_files, output_path):
+            try:
+                # On the inputs' filesystem, so hard links work (the system temp dir is
+                # often tmpfs or another device)
+                staging = tempfile.TemporaryDirectory(dir=source_dir, prefix=".staging-")
+            except OSError:
+                staging = tempfile.TemporaryDirectory()
+            source_dir = Path(stack.enter_context(staging))
+            for pdf_file in pdf_files:
+                staged = source_dir / pdf_file.name
+                try:
+                    os.link(pdf_file, staged)
+                except OSError:
+                    shutil.copy2(pdf_file, staged)
+
+        # Move the old outputs aside, so any output present after the run was written by it
+        # (whatever the exit code, and without trusting timestamps on FAT or network shares)
+        previous = Path(stack.enter_context(tempfile.TemporaryDirectory(dir=output_path, prefix=".previous-")))
+        for pdf_file in pdf_files:
+            try:
+                os.replace(output_path / pdf_file.name, previous / pdf_file.name)
+            except FileNotFoundError:
+                pass
+
+        args = _watermark_cli_args(source_dir, output_path, watermark_image,
+                                   watermark_type, opacity, angle, image_scale, **kwargs)
+        stdout, stderr, return_code = run_watermark_command(args + ["--workers", str(workers)])
+
+        succeeded = []
+        for pdf_file in pdf_files:
+            output_file = output_path / pdf_file.name
+            if output_file.exists():
+                print("✓ " + t('process.processing_successful', src=pdf_file.name, dst=output_file.name))
+                succeeded.append(pdf_file)
+                continue
+            # Not written: put the previous output back rather than leave nothing
+            try:
+                os.replace(previous / pdf_file.name, output_file)
+            except FileNotFoundError:
+                pass
+            print("✗ " + t('process.processing_failed', file=pdf_file.name))
+    if len(succeeded) < len(pdf_files) and stderr.strip():
+        # One CLI run, so its error output is reported once for the batch
+        print(stderr.strip())
+    return succeeded
+
+
+def _is_up_to_date(src: Path, dst: Path) -> bool:
+    """
+    Check whether an output file is at least as new as its source (make-style).
+    
+    Args:
+        src: Input file path
+        dst: Output file path
+        
+    Returns:
+        bool: True if dst exists and is not older than src
+    """
+    try:
+        return dst.stat().st_mtime_ns >= src.stat().st_mtime_ns
+    except OSError:
+        return False
+
+
+def _settings_digest(watermark_image: Optional[str], **settings) -> str:
+    """
+    Fingerprint the watermark settings that outputs were produced with.
+    
+    Args:
+        watermark_image: Watermark image path (its content is hashed), or None
+        **settings: Other watermark parameters
+        
+    Returns:
+        str: Short hex digest
+    """
+    digest = hashlib.sha1(repr(sorted(settings.items())).encode())
+    if watermark_image:
+        try:
+            digest.update(Path(watermark_image).read_bytes())
+        except OSError:
+            pass
+    return digest.hexdigest()[:8]
+
+
+def _load_stamps(stamp: Path) -> Dict[str, str]:
+    """
+    Read a sidecar stamp file mapping output file names to their settings digest.
+    
+    Args:
+        stamp: Stamp file path
+        
+    Returns:
+        Dict[str, str]: {output name: digest}; empty if the file is missing or unreadable
+    """
+    try:
+        stamps = json.loads(stamp.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return stamps if isinstance(stamps, dict) else {}
+
+
+def _save_stamps(stamp: Path, stamps: Dict[str, str]) -> None:
+    """
+    Write a sidecar stamp file atomically.
+    
+    Args:
+        stamp: Stamp file path
+        stamps: {output name: digest}
+    """
+    tmp = stamp.with_name(stamp.name + ".part")
+    tmp.write_text(json.dumps(stamps, ensure_ascii=False, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, stamp)
+
+
+def _forget_stamps(stamp: Path, stamps: Dict[str, str], names: List[str]) -> None:
+    """
+    Drop the stamps of outputs about to be rewritten, before any of them is touched.
+    
+    An interrupted or failed run then leaves those outputs unstamped (rebuilt next time)
+    rather than stamped with the settings of an earlier run.
+    
+    Args:
+        stamp: Stamp file path
+        stamps: Loaded stamps, updated in place
+        names: Output file names about to be rewritten
+    """
+    dropped = [stamps.pop(name) for name in names if name in stamps]
+    if dropped:
+        _save_stamps(stamp, stamps)
+
+
+def _record_stamps(stamp: Path, stamps: Dict[str, str], names: List[str], digest: str) -> None:
+    """
+    Stamp outputs that were written successfully with the current settings.
+    
+    Args:
+        stamp: Stamp file path
+        stamps: Loaded stamps, updated in place
+        names: Output file names written by this run
+        digest: Digest from _settings_digest
+    """
+    if names:
+        stamps.update(dict.fromkeys(names, digest))
+        _save_stamps(stamp, stamps)
 
 
 def process_all_pdfs(
@@ -170,6 +664,9 @@ def process_all_pdfs(
     output_dir: str = "output",
     watermark_image: str = None,
     watermark_type: str = "grid",
+    force: bool = False,
+    files: Optional[List[Path]] = None,
+    max_workers: Optional[int] = None,
     **kwargs
 ) -> bool:
     """
@@ -180,6 +677,9 @@ def process_all_pdfs(
         output_dir: Output directory path, default "output"
         watermark_image: Watermark image path
         watermark_type: Watermark type, default "grid"
+        force: Reprocess files whose output is already up to date
+        files: PDF files to process; scanned from input_dir when omitted
+        max_workers: Number of files watermarked in parallel, default CPU count
         **kwargs: Other watermark parameters
         
     Returns:
@@ -188,37 +688,71 @@ def process_all_pdfs(
     input_path = Path(input_dir)
     output_path = Path(output_dir)
     if not input_path.exists():
-        print("✗ " + t('input_directory_not_exists', directory=input_dir))
+        print("✗ " + t('errors.input_directory_not_exists', directory=input_dir))
         return False
     output_path.mkdir(parents=True, exist_ok=True)
 
-    pdf_files = get_pdf_files(input_path)
+    pdf_files = get_pdf_files(input_path) if files is None else files
     if not pdf_files:
-        print("✗ " + t('no_pdf_files_in_directory', directory=input_dir))
+        print("✗ " + t('errors.no_pdf_files_in_directory', directory=input_dir))
         return False
 
-    print(t('found_pdf_files', count=len(pdf_files)))
-    print(f"{t('watermark_image')}: {watermark_image}")
-    print(f"{t('watermark_type')}: {watermark_type}")
-    print("=" * 50)
+    # Each output records the watermark settings it was made with; outputs made with
+    # other settings are stale whatever their mtime
+    stamp = output_path / ".pdf.stamp"
+    stamps = _load_stamps(stamp)
+    digest = _settings_digest(watermark_image, watermark_type=watermark_type, **kwargs)
+
+    sys.stdout.write(
+        f"{t('process.found_pdf_files', count=len(pdf_files))}\n"
+        f"{t('process.watermark_image')}: {watermark_image}\n"
+        f"{t('config.watermark_type')}: {watermark_type}\n"
+        f"{_SEP}\n"
+    )
 
-    success_count = 0
     total_count = len(pdf_files)
+    stale_files = []
     for pdf_file in pdf_files:
-        output_file = output_path / pdf_file.name
-        if add_watermark_to_file(
-            pdf_file,
-            output_file,
-            watermark_image=watermark_image,
-            watermark_type=watermark_type,
-            **kwargs
-        ):
-            success_count += 1
-
-    print("=" * 50)
-    print(t('pdf_processing_completed', success=success_count, total=total_count))
+        if (not force and stamps.get(pdf_file.name) == digest
+                and _is_up_to_date(pdf_file, output_path / pdf_file.name)):
+            print("✓ " + t('process.skipped_up_to_date', file=pdf_file.name))
+        else:
+            stale_files.append(pdf_file)
+    # Skipped files count as successful
+    success_count = total_count - len(stale_files)
+    workers = min(max_workers or os.cpu_count() or 1, len(stale_files))
+    _forget_stamps(stamp, stamps, [pdf_file.name for pdf_file in stale_files])
+
+    succeeded = []
+    if len(stale_files) > 1 and _load_watermark_api() is None:
+        # Only the CLI is available: start it once for the whole batch
+        succeeded = _watermark_batch_with_cli(stale_files, output_path, watermark_image,
+                                              watermark_type, workers=workers, **kwargs)
+    elif workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        # pdf-watermark (pypdf/reportlab) is pure-Python CPU work that threads would serialize
+        # on the GIL, so files run in worker processes. Results are reported here, in order.
+        output_files = [output_path / pdf_file.name for pdf_file in stale_files]
+        watermark_one = functools.partial(_apply_watermark, watermark_image=watermark_image,
+                                          watermark_type=watermark_type, **kwargs)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(watermark_one, stale_files, output_files)
+            for pdf_file, output_file, (ok, error) in zip(stale_files, output_files, results):
+                if _report_watermark_result(pdf_file, output_file, ok, error):
+                    succeeded.append(pdf_file)
+    else:
+        for pdf_file in stale_files:
+            if add_watermark_to_file(pdf_file, output_path / pdf_file.name,
+                                     watermark_image=watermark_image,
+                                     watermark_type=watermark_type, **kwargs):
+                succeeded.append(pdf_file)
+
+    success_count += len(succeeded)
+    _record_stamps(stamp, stamps, [pdf_file.name for pdf_file in succeeded], digest)
+    sys.stdout.write(f"{_SEP}\n{t('process.pdf_processing_completed', success=success_count, total=total_count)}\n")
     if success_count < total_count:
-        print("✗ " + t('processing_failed'))
+        print("✗ " + t('process.processing_failed'))
         return False
     return True
 
@@ -235,265 +769,614 @@ def get_md_files(input_dir: Path) -> List[Path]:
     Returns:
         List[Path]: Sorted list of Markdown file paths
     """
-    md_files: List[Path] = []
-    for pattern in ["*.md", "*.MD", "*.markdown"]:
-        md_files.extend(input_dir.glob(pattern))
-    return sorted(md_files)
-
-
-def md_to_pdf_with_mermaid(md_path: Path, out_pdf: Path) -> bool:
-    """
-    Convert Markdown to a Mermaid-supported PDF using Playwright.
-    
-    Args:
-        md_path: Input Markdown file path
-        out_pdf: Output PDF file path
-        
-    Returns:
-        bool: True if succeeded, False otherwise
-    """
-    try:
-        from playwright.sync_api import sync_playwright  # type: ignore
-    except Exception:
-        print("✗ " + t('missing_dependency_playwright'))
-        return False
-    # Read raw Markdown source; we'll render with markdown-it in the browser to match VSCode markdown-preview-enhanced
-    md_text = md_path.read_text(encoding="utf-8")
-    md_source_js = json.dumps(md_text)
+    return _list_files_with_suffix(input_dir, MD_SUFFIXES)
 
-    # Base directory (as file:// URI) for resolving relative paths in JS (images, local links)
-    base_href = md_path.parent.resolve().as_uri() + "/"
 
-    html = f"""
-<!doctype html>
+# Shared page template: loads markdown-it, highlight.js and KaTeX (Mermaid on demand) and
+# exposes window.renderMd({source, mathList, baseHref, title}) to render a document into #md-root.
+# Rendered with markdown-it in the browser to match VSCode markdown-preview-enhanced.
+_HTML_TEMPLATE = """<!doctype html>
 <html>
 <head>
 <meta charset=\"utf-8\">
-<title>{md_path.stem}</title>
+<title></title>
 <link rel=\"preconnect\" href=\"https://cdnjs.cloudflare.com\">
 <link rel=\"stylesheet\" href=\"https://cdnjs.cloudflare.com/ajax/libs/github-markdown-css/5.5.1/github-markdown.min.css\">
 <link rel=\"stylesheet\" href=\"https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.9.0/styles/github.min.css\">
 <!-- KaTeX for LaTeX math rendering -->
 <link rel=\"stylesheet\" href=\"https://cdn.jsdelivr.net/npm/katex@0.16.9/dist/katex.min.css\">
 <style>
-@page {{ size: A4; margin: 18mm; }}
-body {{
+@page { size: A4; margin: 18mm; }
+body {
   font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, 'Noto Sans', 'Liberation Sans', 'PingFang SC', 'Hiragino Sans GB', 'Microsoft YaHei', 'WenQuanYi Micro Hei', sans-serif;
   line-height: 1.6;
-}}
-.markdown-body {{ box-sizing: border-box; min-width: 200px; max-width: 980px; margin: 0 auto; }}
-pre, code {{ font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, 'Liberation Mono', 'Courier New', monospace; }}
-.mermaid {{ text-align: center; margin: 12px 0; }}
-h1, h2, h3 {{ page-break-after: avoid; }}
-img {{ max-width: 100%; }}
+}
+.markdown-body { box-sizing: border-box; min-width: 200px; max-width: 980px; margin: 0 auto; }
+pre, code { font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, 'Liberation Mono', 'Courier New', monospace; }
+.mermaid { text-align: center; margin: 12px 0; }
+h1, h2, h3 { page-break-after: avoid; }
+img { max-width: 100%; }
 /* List styling to mirror GitHub/markdown-it */
-.markdown-body ul {{ list-style-type: disc; padding-left: 2em; }}
-.markdown-body ul ul {{ list-style-type: circle; }}
-.markdown-body ul ul ul {{ list-style-type: square; }}
-.markdown-body ol {{ padding-left: 2em; }}
+.markdown-body ul { list-style-type: disc; padding-left: 2em; }
+.markdown-body ul ul { list-style-type: circle; }
+.markdown-body ul ul ul { list-style-type: square; }
+.markdown-body ol { padding-left: 2em; }
 /* KaTeX math rendering styles */
-.katex {{ font-size: 1.1em; }}
-.katex-display {{ margin: 1em 0; }}
+.katex { font-size: 1.1em; }
+.katex-display { margin: 1em 0; }
 </style>
-<script src=\"https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.min.js\"></script>
 <script src=\"https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.9.0/highlight.min.js\"></script>
 <!-- markdown-it (same family as VSCode markdown-preview-enhanced) -->
-<script src=\"https://cdn.jsdelivr.net/npm/markdown-it@14/dist/markdown-it.min.js\"></script>
+<script src=\"https://cdn.jsdelivr.net/npm/markdown-it@14.1.0/dist/markdown-it.min.js\"></script>
 <!-- KaTeX for rendering LaTeX math expressions -->
 <script src=\"https://cdn.jsdelivr.net/npm/katex@0.16.9/dist/katex.min.js\"></script>
 <script src=\"https://cdn.jsdelivr.net/npm/katex@0.16.9/dist/contrib/auto-render.min.js\"></script>
-<script>mermaid.initialize({{ startOnLoad: false, securityLevel: 'loose' }});</script>
 </head>
 <body>
 <article class=\"markdown-body\" id=\"md-root\"></article>
 <script>
-// Expose base path for fixing local links (used below)
-window.__MD_BASE_HREF__ = {json.dumps(base_href)};
-</script>
-<script>
-(function() {{
-  const mdSrc = {md_source_js};
-  // Pre-process: replace math expressions with HTML comments as placeholders
-  // This prevents markdown-it from processing them
-  const mathData = [];
-  let processedMd = mdSrc;
-  
-  // Handle display math $$...$$ first (must be processed before inline $)
-  processedMd = processedMd.replace(/\\$\\$([\\s\\S]*?)\\$\\$/g, (match, content) => {{
-    const id = mathData.length;
-    mathData.push({{ type: 'display', content: content.trim() }});
-    return `<!--MATH_DISPLAY_${{id}}-->`;
-  }});
-  
-  // Handle inline math $...$ (avoid matching $$ by checking it's not preceded or followed by $)
-  // Use a function to check context since lookbehind may not be supported
-  processedMd = processedMd.replace(/\\$([^$\\n]+?)\\$/g, (match, content, offset, string) => {{
-    // Check if this is actually part of a $$...$$ (already processed)
-    if (string.substring(Math.max(0, offset - 1), offset) === '$' || 
-        string.substring(offset + match.length, offset + match.length + 1) === '$') {{
-      return match; // Skip, it's part of display math
-    }}
-    // Check if it's inside a comment placeholder (already processed)
-    const before = string.substring(Math.max(0, offset - 50), offset);
-    const after = string.substring(offset + match.length, offset + match.length + 50);
-    if (before.includes('<!--MATH_') || after.includes('<!--MATH_')) {{
-      return match; // Skip
-    }}
-    const id = mathData.length;
-    mathData.push({{ type: 'inline', content: content.trim() }});
-    return `<!--MATH_INLINE_${{id}}-->`;
-  }});
-  
-  const md = window.markdownit({{ html: true, linkify: true, typographer: true, breaks: true }});
-  let html = md.render(processedMd);
+// Entry point called per document via page.evaluate(); the page itself is shared by the whole batch
+// Mermaid is by far the largest script, so only documents with diagrams load it
+window.loadMermaid = function() {
+  if (window.mermaid) return Promise.resolve(window.mermaid);
+  return new Promise((resolve, reject) => {
+    const script = document.createElement('script');
+    script.src = 'https://cdn.jsdelivr.net/npm/mermaid@10.9.1/dist/mermaid.min.js';
+    script.onload = () => {
+      window.mermaid.initialize({ startOnLoad: false, securityLevel: 'loose' });
+      resolve(window.mermaid);
+    };
+    script.onerror = reject;
+    document.head.appendChild(script);
+  });
+};
+
+window.renderMd = function({ source, mathList, baseHref, title }) {
+  // The page is reused for several documents: a late Mermaid/font promise from an
+  // earlier (timed-out) render must not mark this one as done
+  const renderId = window.__RENDER_ID__ = (window.__RENDER_ID__ || 0) + 1;
+  window.__RENDER_DONE__ = false;
+  document.title = title;
+  // Math has already been swapped for <!--MATH_*--> placeholders (and HTML-escaped)
+  // on the Python side, so markdown-it never sees it
+  const md = window.markdownit({ html: true, linkify: true, typographer: true, breaks: true });
+  let html = md.render(source);
   
   // Replace HTML comment placeholders with actual math elements
-  mathData.forEach((math, index) => {{
-    const displayComment = `<!--MATH_DISPLAY_${{index}}-->`;
-    const inlineComment = `<!--MATH_INLINE_${{index}}-->`;
-    const comment = math.type === 'display' ? displayComment : inlineComment;
-    
-    if (html.includes(comment)) {{
+  mathList.forEach((math, index) => {
+    const comment = math.type === 'display' ? `<!--MATH_DISPLAY_${index}-->` : `<!--MATH_INLINE_${index}-->`;
+    if (html.includes(comment)) {
       const tag = math.type === 'display' ? 'div' : 'span';
       const className = math.type === 'display' ? 'katex-display' : 'math-inline';
-      const mathElement = `<${{tag}} class="${{className}}" data-math-content="${{math.content.replace(/"/g, '&quot;')}}">${{math.content}}</${{tag}}>`;
-      html = html.replace(comment, mathElement);
-    }}
-  }});
+      html = html.replace(comment, `<${tag} class="${className}" data-math-content="${math.content}">${math.content}</${tag}>`);
+    }
+  });
   
   const root = document.getElementById('md-root');
   root.innerHTML = html;
 
   // Normalize local image sources and links to absolute file:// URLs based on the markdown file directory
-  try {{
-    const base = window.__MD_BASE_HREF__;
-    if (base) {{
+  try {
+    const base = baseHref;
+    if (base) {
       // Fix <img src="..."> so that ./xxx.png 指向 markdown 所在目录，而不是输出 html 所在目录
       const imgs = root.querySelectorAll('img[src]');
-      imgs.forEach(img => {{
+      imgs.forEach(img => {
         const src = img.getAttribute('src');
         if (!src) return;
         // Skip absolute/remote/data URLs
         if (/^(https?:|data:|ftp:)/i.test(src)) return;
-        try {{
+        try {
           const u = new URL(src, base);
           img.setAttribute('src', u.href);
-        }} catch (e) {{}}
-      }});
+        } catch (e) {}
+      });
 
       // Fix <a href="..."> for local files (.ulg 等)
       const anchors = root.querySelectorAll('a[href]');
-      anchors.forEach(a => {{
+      anchors.forEach(a => {
         const href = a.getAttribute('href');
         if (!href) return;
         // Only rewrite relative links, skip http(s), mailto etc.
         if (/^(https?:|mailto:|tel:|ftp:)/i.test(href)) return;
-        try {{
+        try {
           const u = new URL(href, base);
           a.setAttribute('href', u.href);
-        }} catch (e) {{}}
-      }});
-    }}
-  }} catch (e) {{}}
+        } catch (e) {}
+      });
+    }
+  } catch (e) {}
   // Convert mermaid code blocks
   const blocks = Array.from(root.querySelectorAll('code.language-mermaid, pre code.language-mermaid'));
-  blocks.forEach((code) => {{
+  blocks.forEach((code) => {
     const parent = code.closest('pre') || code;
     const container = document.createElement('div');
     container.className = 'mermaid';
     container.textContent = code.textContent;
     parent.replaceWith(container);
-  }});
-  try {{ window.hljs?.highlightAll(); }} catch (e) {{}}
+  });
+  try { window.hljs?.highlightAll(); } catch (e) {}
   // Render math expressions with KaTeX
-  try {{
-    if (window.katex) {{
+  try {
+    if (window.katex) {
       // Render inline math (span.math-inline elements)
-      root.querySelectorAll('span.math-inline').forEach(span => {{
+      root.querySelectorAll('span.math-inline').forEach(span => {
         const mathContent = span.getAttribute('data-math-content') || span.textContent || '';
-        if (mathContent && !span.querySelector('.katex')) {{
-          try {{
-            window.katex.render(mathContent.trim(), span, {{ throwOnError: false, displayMode: false }});
-          }} catch (e) {{
+        if (mathContent && !span.querySelector('.katex')) {
+          try {
+            window.katex.render(mathContent.trim(), span, { throwOnError: false, displayMode: false });
+          } catch (e) {
             console.warn('KaTeX inline math error:', e, mathContent);
-          }}
-        }}
-      }});
+          }
+        }
+      });
       // Render display math (div.katex-display elements)
-      root.querySelectorAll('div.katex-display').forEach(div => {{
+      root.querySelectorAll('div.katex-display').forEach(div => {
         const mathContent = div.getAttribute('data-math-content') || div.textContent || '';
-        if (mathContent && !div.querySelector('.katex')) {{
-          try {{
-            window.katex.render(mathContent.trim(), div, {{ throwOnError: false, displayMode: true }});
-          }} catch (e) {{
+        if (mathContent && !div.querySelector('.katex')) {
+          try {
+            window.katex.render(mathContent.trim(), div, { throwOnError: false, displayMode: true });
+          } catch (e) {
             console.warn('KaTeX display math error:', e, mathContent);
-          }}
-        }}
-      }});
-    }}
+          }
+        }
+      });
+    }
     // Also use auto-render as fallback for any remaining math expressions
-    if (window.renderMathInElement) {{
-      window.renderMathInElement(root, {{
+    if (window.renderMathInElement) {
+      window.renderMathInElement(root, {
         delimiters: [
-          {{left: '$$', right: '$$', display: true}},
-          {{left: '$', right: '$', display: false}},
-          {{left: '\\\\[', right: '\\\\]', display: true}},
-          {{left: '\\\\(', right: '\\\\)', display: false}}
+          {left: '$$', right: '$$', display: true},
+          {left: '$', right: '$', display: false},
+          {left: '\\\\[', right: '\\\\]', display: true},
+          {left: '\\\\(', right: '\\\\)', display: false}
         ],
         throwOnError: false,
         strict: false
-      }});
-    }}
-  }} catch (e) {{ console.error('KaTeX rendering error:', e); }}
-  setTimeout(() => window.mermaid?.init(), 50);
-}})();
+      });
+    }
+  } catch (e) { console.error('KaTeX rendering error:', e); }
+  // Everything above is synchronous; only images, Mermaid and web fonts finish later
+  const imagesDone = Array.from(root.querySelectorAll('img'))
+    .map((img) => (img.complete ? null : img.decode().catch(() => {})));
+  const mermaidDone = root.querySelector('.mermaid')
+    ? window.loadMermaid()
+        .then((mermaid) => mermaid.run({ querySelector: '#md-root .mermaid' }))
+        .catch((e) => console.error('Mermaid rendering error:', e))
+    : Promise.resolve();
+  Promise.all([...imagesDone, mermaidDone, document.fonts.ready]).finally(() => {
+    if (window.__RENDER_ID__ === renderId) window.__RENDER_DONE__ = true;
+  });
+};
 </script>
 </body>
 </html>
 """
- 
-    out_pdf.parent.mkdir(parents=True, exist_ok=True)
 
-    # Write HTML to a temporary file and open it via file:// URL so that Chromium
-    # is allowed to load local images referenced by relative paths.
-    tmp_html_path = out_pdf.with_suffix(".html")
-    tmp_html_path.write_text(html, encoding="utf-8")
 
+# Local copies of the template's CDN assets (relative to the vendor dir). Each is loaded
+# via file:// only if its SHA-256 matches _VENDOR_SHA256, so later runs need no network.
+_VENDOR_DIR = Path(__file__).resolve().parent / "assets" / "vendor"
+_VENDOR_ASSETS = {
+    "github-markdown.min.css": "https://cdnjs.cloudflare.com/ajax/libs/github-markdown-css/5.5.1/github-markdown.min.css",
+    "highlight-github.min.css": "https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.9.0/styles/github.min.css",
+    "highlight.min.js": "https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.9.0/highlight.min.js",
+    "mermaid.min.js": "https://cdn.jsdelivr.net/npm/mermaid@10.9.1/dist/mermaid.min.js",
+    "markdown-it.min.js": "https://cdn.jsdelivr.net/npm/markdown-it@14.1.0/dist/markdown-it.min.js",
+    "katex/katex.min.css": "https://cdn.jsdelivr.net/npm/katex@0.16.9/dist/katex.min.css",
+    "katex/katex.min.js": "https://cdn.jsdelivr.net/npm/katex@0.16.9/dist/katex.min.js",
+    "katex/auto-render.min.js": "https://cdn.jsdelivr.net/npm/katex@0.16.9/dist/contrib/auto-render.min.js",
+}
+# Expected SHA-256 (hex) of each asset above, keyed by the same name; KaTeX fonts are keyed
+# as "katex/fonts/<file>". An asset without an entry is never vendored and keeps its CDN
+# URL, so add the digest (sha256sum of the pinned URL's content) when bumping a version.
+_VENDOR_SHA256: Dict[str, str] = {}
+# katex.min.css references its fonts relative to itself
+_KATEX_FONT_RE = re.compile(r"url\((fonts/[^)]+?\.woff2)\)")
+_DOWNLOAD_FAILED_MARKER_NAME = ".download-failed"
+_DOWNLOAD_RETRY_SECONDS = 3600
+
+
+@functools.lru_cache(maxsize=1)
+def _vendor_dir() -> Path:
+    """
+    Return the directory vendored assets are stored in.
+    
+    assets/vendor/ next to this file when it can be written, otherwise a per-user cache
+    directory (e.g. when the tool is installed read-only).
+    """
+    existing = _VENDOR_DIR
+    while not existing.exists() and existing != existing.parent:
+        existing = existing.parent
+    if os.access(existing, os.W_OK):
+        return _VENDOR_DIR
+    cache_root = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME")
+    base = Path(cache_root) if cache_root else Path.home() / ".cache"
+    return base / "markdown-to-pdf-tool" / "vendor"
+
+
+def _sha256_matches(path: Path, expected: str) -> bool:
+    """Return whether the file's SHA-256 equals expected (False if it can't be read)."""
     try:
-        with sync_playwright() as p:
-            # Allow Chromium to load local file:// resources (images, etc.)
-            browser = p.chromium.launch(args=["--allow-file-access-from-files"])
-            page = browser.new_page()
-            page.goto(tmp_html_path.resolve().as_uri(), wait_until="networkidle")
-            try:
-                # Wait until markdown-it rendering produced list items and (if present) mermaid completed
-                page.wait_for_function("document.querySelectorAll('#md-root li').length > 0", timeout=5000)
-                page.wait_for_function("document.querySelectorAll('.mermaid').length == 0 || document.querySelectorAll('.mermaid svg').length >= document.querySelectorAll('.mermaid').length", timeout=5000)
-            except Exception:
-                pass
-            # Wait for styles to be fully applied
-            page.wait_for_timeout(500)
-            page.pdf(path=str(out_pdf), print_background=True, prefer_css_page_size=True)
-            browser.close()
-        print("✓ " + t('conversion_successful', input_file=md_path.name, output_file=out_pdf.name))
+        return hashlib.sha256(path.read_bytes()).hexdigest() == expected.lower()
+    except OSError:
+        return False
+
+
+def _download(url: str, dest: Path, sha256: str) -> bool:
+    """Download url to dest atomically if its SHA-256 matches. Returns False on any failure."""
+    import urllib.request  # Only needed the first time assets are fetched
+
+    tmp = dest.with_name(dest.name + ".part")
+    try:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        with urllib.request.urlopen(url, timeout=5) as resp:
+            data = resp.read()
+        if hashlib.sha256(data).hexdigest() != sha256.lower():
+            return False
+        tmp.write_bytes(data)
+        os.replace(tmp, dest)
         return True
+    except Exception:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        return False
+
+
+@functools.lru_cache(maxsize=1)
+def _build_html_template() -> str:
+    """
+    Return the page template with every verified vendored asset pointing at its local copy.
+    
+    Assets are downloaded into the vendor dir once and checked against _VENDOR_SHA256 on
+    every run; a copy that doesn't match is fetched again. Any asset without a known
+    digest, or that cannot be fetched (e.g. offline on the first run), keeps its CDN URL.
+    After a failed download no further fetches are attempted for _DOWNLOAD_RETRY_SECONDS.
+    """
+    vendor_dir = _vendor_dir()
+    failed_marker = vendor_dir / _DOWNLOAD_FAILED_MARKER_NAME
+    try:
+        offline = time.time() - failed_marker.stat().st_mtime < _DOWNLOAD_RETRY_SECONDS
+    except OSError:
+        offline = False
+
+    def _fetch(name: str, url: str) -> bool:
+        nonlocal offline
+        expected = _VENDOR_SHA256.get(name)
+        if not expected:
+            return False
+        dest = vendor_dir / name
+        if _sha256_matches(dest, expected):
+            return True
+        if offline:
+            return False
+        if _download(url, dest, expected):
+            return True
+        # Most likely offline: skip the remaining assets too
+        offline = True
+        try:
+            failed_marker.parent.mkdir(parents=True, exist_ok=True)
+            failed_marker.touch()
+        except OSError:
+            pass
+        return False
+
+    html_text = _HTML_TEMPLATE
+    for name, url in _VENDOR_ASSETS.items():
+        if not _fetch(name, url):
+            continue
+        local = vendor_dir / name
+        if name == "katex/katex.min.css":
+            # Checked on every run, so fonts missed by an interrupted first download are
+            # retried; until all are present the CDN stylesheet (and its fonts) is used
+            base = url.rsplit("/", 1)[0]
+            fonts = set(_KATEX_FONT_RE.findall(local.read_text(encoding="utf-8")))
+            if not all([_fetch(f"katex/{font}", f"{base}/{font}") for font in fonts]):
+                continue
+        html_text = html_text.replace(url, local.as_uri())
+    return html_text
+
+
+# Display math $$...$$ is extracted before inline $...$ so the latter never sees a "$$"
+_DISPLAY_MATH_RE = re.compile(r"\$\$([\s\S]*?)\$\$")
+_INLINE_MATH_RE = re.compile(r"\$([^$\n]+?)\$")
+
+
+def _extract_math(md_text: str) -> Tuple[str, List[dict]]:
+    """
+    Replace math expressions with HTML comment placeholders so markdown-it leaves them alone.
+    
+    Args:
+        md_text: Raw Markdown source
+        
+    Returns:
+        Tuple[str, List[dict]]: (processed Markdown, math entries with HTML-escaped content)
+    """
+    math_list: List[dict] = []
+
+    def _placeholder(kind: str, content: str) -> str:
+        math_list.append({"type": kind, "content": html.escape(content.strip())})
+        return f"<!--MATH_{kind.upper()}_{len(math_list) - 1}-->"
+
+    def _inline(match: "re.Match") -> str:
+        text, start, end = match.string, match.start(), match.end()
+        # Part of a $$...$$ that was not closed
+        if text[start - 1:start] == "$" or text[end:end + 1] == "$":
+            return match.group(0)
+        # Right next to an already processed placeholder
+        if "<!--MATH_" in text[max(0, start - 50):start] or "<!--MATH_" in text[end:end + 50]:
+            return match.group(0)
+        return _placeholder("inline", match.group(1))
+
+    processed = _DISPLAY_MATH_RE.sub(lambda m: _placeholder("display", m.group(1)), md_text)
+    processed = _INLINE_MATH_RE.sub(_inline, processed)
+    return processed, math_list
+
+
+def _prepare_markdown(md_path: Path) -> Tuple[str, List[dict]]:
+    """Read a Markdown file and extract its math; see _extract_math."""
+    return _extract_math(md_path.read_text(encoding="utf-8"))
+
+
+async def _launch_browser(playwright):
+    """Launch Chromium, allowing it to load local file:// resources (images, etc.)."""
+    return await playwright.chromium.launch(args=["--allow-file-access-from-files"])
+
+
+# Receives (Markdown path, output PDF path, rendered PDF bytes) and stores the result
+PdfSink = Callable[[Path, Path, bytes], bool]
+
+
+def _write_pdf(md_path: Path, out_pdf: Path, pdf_data: bytes) -> bool:
+    """Default PdfSink: write the rendered PDF unchanged."""
+    try:
+        out_pdf.write_bytes(pdf_data)
+    except OSError as e:
+        print("✗ " + t('process.conversion_failed_with_error', file=md_path.name, error=str(e)))
+        return False
+    return True
+
+
+async def _open_template_page(browser, template_url: str):
+    """
+    Open a page with the shared HTML template loaded, ready for window.renderMd.
+    
+    Args:
+        browser: Playwright browser
+        template_url: file:// URL of the shared HTML template
+        
+    Returns:
+        Page: The loaded Playwright page
+    """
+    context = await browser.new_context()
+    page = await context.new_page()
+    await page.goto(template_url, wait_until="load")
+    return page
+
+
+async def _render_md_page(page, md_path: Path, out_pdf: Path, prepared, sink: PdfSink) -> bool:
+    """
+    Render one Markdown file to PDF on a page that already has the template loaded.
+    
+    The page is reused for the next file, so markdown-it, highlight.js, KaTeX and
+    Mermaid are parsed and JIT-compiled once per worker rather than once per file.
+    
+    Args:
+        page: Playwright page from _open_template_page
+        md_path: Input Markdown file path
+        out_pdf: Output PDF file path
+        prepared: Awaitable of _prepare_markdown(md_path), started ahead of time
+        sink: Called in a worker thread with the rendered PDF bytes
+        
+    Returns:
+        bool: True if succeeded, False otherwise
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    try:
+        source, math_list = await prepared
+        await page.evaluate("(args) => window.renderMd(args)", {
+            # Markdown source with math swapped for placeholders; rendered with markdown-it in the browser
+            "source": source,
+            "mathList": math_list,
+            # Base directory (as file:// URI) for resolving relative paths in JS (images, local links)
+            "baseHref": md_path.parent.resolve().as_uri() + "/",
+            "title": md_path.stem,
+        })
+        try:
+            # renderMd raises the flag once images, Mermaid diagrams and fonts are done
+            await page.wait_for_function("window.__RENDER_DONE__ === true", timeout=10000)
+        except Exception:
+            pass
+        # Keep the PDF in memory; the sink decides how it reaches out_pdf
+        pdf_data = await page.pdf(print_background=True, prefer_css_page_size=True)
     except Exception as e:
-        print("✗ " + t('conversion_failed_with_error', file=md_path.name, error=str(e)))
+        print("✗ " + t('process.conversion_failed_with_error', file=md_path.name, error=str(e)))
+        try:
+            # Give the next file a clean template
+            await page.reload(wait_until="load")
+        except Exception:
+            pass
         return False
+    print("✓ " + t('process.conversion_successful', input_file=md_path.name, output_file=out_pdf.name))
+    return await loop.run_in_executor(None, sink, md_path, out_pdf, pdf_data)
+
+
+async def _convert_batch_async(
+    async_playwright,
+    jobs: List[Tuple[Path, Path]],
+    workers: int,
+    sink: PdfSink,
+) -> List[bool]:
+    """Render jobs concurrently on one browser, with `workers` reusable pages consuming a queue."""
+    import asyncio
+
+    # Write the shared template once; Chromium opens it via file:// so that local
+    # images referenced by relative paths can be loaded.
+    with tempfile.NamedTemporaryFile("w", suffix=".html", encoding="utf-8", delete=False) as tmp:
+        tmp.write(_build_html_template())
+    template_path = Path(tmp.name)
+    template_url = template_path.resolve().as_uri()
+
+    try:
+        async with async_playwright() as p:
+            browser = await _launch_browser(p)
+            try:
+                loop = asyncio.get_running_loop()
+                # Producer/consumer: Markdown files are read and prepared in worker threads
+                # a few jobs ahead, so file I/O overlaps with the pages that are rendering
+                ready: asyncio.Queue = asyncio.Queue(maxsize=workers)
+                results: List[bool] = [False] * len(jobs)
+
+                async def _produce() -> None:
+                    for index, (md_path, out_pdf) in enumerate(jobs):
+                        prepared = loop.run_in_executor(None, _prepare_markdown, md_path)
+                        await ready.put((index, md_path, out_pdf, prepared))
+                    for _ in range(workers):
+                        await ready.put(None)
+
+                async def _consume(page) -> None:
+                    while True:
+                        job = await ready.get()
+                        if job is None:
+                            return
+                        index, md_path, out_pdf, prepared = job
+                        results[index] = await _render_md_page(page, md_path, out_pdf, prepared, sink)
+
+                producer = asyncio.ensure_future(_produce())
+                pages = await asyncio.gather(
+                    *(_open_template_page(browser, template_url) for _ in range(workers))
+                )
+                await asyncio.gather(producer, *(_consume(page) for page in pages))
+                return results
+            finally:
+                await browser.close()
     finally:
         try:
-            if tmp_html_path.exists():
-                tmp_html_path.unlink()
-        except Exception:
+            template_path.unlink()
+        except OSError:
             # Best-effort cleanup only
             pass
 
 
+def _convert_batch(
+    jobs: List[Tuple[Path, Path]],
+    sink: PdfSink = _write_pdf,
+    max_workers: Optional[int] = None,
+) -> List[Path]:
+    """
+    Convert Markdown files to PDF, launching Chromium once for the whole batch.
+    
+    Several pages render concurrently, each in its own context and reused across files.
+    
+    Args:
+        jobs: (Markdown path, output PDF path) pairs
+        sink: Stores each rendered PDF, default writes it to the output path
+        max_workers: Pages rendered at once, default CPU count capped at MAX_BROWSER_WORKERS
+        
+    Returns:
+        List[Path]: Output PDF paths that were converted successfully
+    """
+    if not jobs:
+        return []
+    import asyncio
+
+    # Create each output directory once per batch rather than once per file
+    for out_dir in {out_pdf.parent for _, out_pdf in jobs}:
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+    try:
+        from playwright.async_api import async_playwright  # type: ignore
+    except Exception:
+        print("✗ " + t('errors.missing_dependency_playwright'))
+        return []
+
+    workers = min(max_workers or min(os.cpu_count() or 1, MAX_BROWSER_WORKERS), len(jobs))
+    try:
+        results = asyncio.run(_convert_batch_async(async_playwright, jobs, workers, sink))
+    except Exception as e:
+        # Browser failed to start; none of the files were converted
+        for md_path, _ in jobs:
+            print("✗ " + t('process.conversion_failed_with_error', file=md_path.name, error=str(e)))
+        return []
+    return [out_pdf for (_, out_pdf), ok in zip(jobs, results) if ok]
+
+
+def md_to_pdf_with_mermaid(md_path: Path, out_pdf: Path) -> bool:
+    """
+    Convert Markdown to a Mermaid-supported PDF using Playwright.
+    
+    Args:
+        md_path: Input Markdown file path
+        out_pdf: Output PDF file path
+        
+    Returns:
+        bool: True if succeeded, False otherwise
+    """
+    return bool(_convert_batch([(md_path, out_pdf)]))
+
+
+def _watermark_layout(config: Optional[dict]) -> dict:
+    """
+    Collect the watermark layout parameters from user configuration or defaults.
+    
+    Args:
+        config: User configuration dictionary
+        
+    Returns:
+        dict: Keyword arguments for _apply_watermark
+    """
+    config = config or {}
+    return {
+        "watermark_type": config.get("watermark_type", CONFIG.watermark_type),
+        "opacity": config.get("opacity", CONFIG.opacity),
+        "angle": config.get("angle", CONFIG.angle),
+        "image_scale": config.get("image_scale", CONFIG.image_scale),
+        "horizontal_boxes": config.get("horizontal_boxes", CONFIG.horizontal_boxes),
+        "vertical_boxes": config.get("vertical_boxes", CONFIG.vertical_boxes),
+    }
+
+
+def _watermark_converted_pdf(
+    md_path: Path,
+    out_pdf: Path,
+    pdf_data: bytes,
+    watermark_image: str,
+    config: Optional[dict],
+) -> bool:
+    """
+    Watermark a freshly rendered PDF and write it to its final path.
+
+    Args:
+        md_path: Source Markdown file path (for messages)
+        out_pdf: Output PDF file path
+        pdf_data: Rendered PDF bytes, not yet written to disk
+        watermark_image: Watermark image path
+        config: User configuration dictionary
+
+    Returns:
+        bool: True if succeeded, False otherwise
+    """
+    ok, error = _apply_watermark(io.BytesIO(pdf_data), out_pdf, watermark_image,
+                                 **_watermark_layout(config))
+    if not ok:
+        print("✗ " + t('process.processing_failed_with_error', file=md_path.name, error=error))
+        return False
+    print("✓ " + t('process.processing_successful', src=md_path.name, dst=out_pdf.name))
+    return True
+
+
 def process_all_mds(
     input_dir: str = "input",
     output_dir: str = "output",
     watermark_image: Optional[str] = None,
     config: Optional[dict] = None,
+    force: bool = False,
+    files: Optional[List[Path]] = None,
+    max_workers: Optional[int] = None,
 ) -> bool:
     """
     Process all Markdown files, convert to PDF, and add watermark.
@@ -503,6 +1386,9 @@ def process_all_mds(
         output_dir: Output directory path, default "output"
         watermark_image: Watermark image path
         config: User configuration dictionary
+        force: Reconvert files whose output is already up to date
+        files: Markdown files to convert; scanned from input_dir when omitted
+        max_workers: Number of pages rendered in parallel, see _convert_batch
         
     Returns:
         bool: True if all files succeeded, else False
@@ -510,53 +1396,56 @@ def process_all_mds(
     input_path = Path(input_dir)
     output_path = Path(output_dir)
     if not input_path.exists():
-        print("✗ " + t('input_directory_not_exists', directory=input_dir))
+        print("✗ " + t('errors.input_directory_not_exists', directory=input_dir))
         return False
     output_path.mkdir(parents=True, exist_ok=True)
 
-    md_files = get_md_files(input_path)
+    md_files = get_md_files(input_path) if files is None else files
     if not md_files:
-        print("✗ " + t('no_md_files_in_directory', directory=input_dir))
+        print("✗ " + t('errors.no_md_files_in_directory', directory=input_dir))
         return False
 
-    print(t('found_md_files', count=len(md_files)))
-    ok = 0
+    print(t('process.found_md_files', count=len(md_files)))
+    # Each output records the watermark settings it was made with; outputs made with
+    # other settings are stale whatever their mtime
+    stamp = output_path / ".md.stamp"
+    stamps = _load_stamps(stamp)
+    digest = _settings_digest(watermark_image, **(_watermark_layout(config) if watermark_image else {}))
+    jobs = []
     for md in md_files:
         out_pdf = output_path / f"{md.stem}.pdf"
-        if md_to_pdf_with_mermaid(md, out_pdf):
-            # After conversion, add watermark (image watermark only)
-            watermark_success = True
-            if watermark_image:
-                # Use user configuration or defaults
-                watermark_type = config.get("watermark_type", WatermarkConfig.WATERMARK_TYPE) if config else WatermarkConfig.WATERMARK_TYPE
-                horizontal_boxes = config.get("horizontal_boxes", WatermarkConfig.HORIZONTAL_BOXES) if config else WatermarkConfig.HORIZONTAL_BOXES
-                vertical_boxes = config.get("vertical_boxes", WatermarkConfig.VERTICAL_BOXES) if config else WatermarkConfig.VERTICAL_BOXES
-                angle = config.get("angle", WatermarkConfig.ANGLE) if config else WatermarkConfig.ANGLE
-                opacity = config.get("opacity", WatermarkConfig.OPACITY) if config else WatermarkConfig.OPACITY
-                image_scale = config.get("image_scale", WatermarkConfig.IMAGE_SCALE) if config else WatermarkConfig.IMAGE_SCALE
-                
-                watermark_success = add_watermark_to_file(
-                    input_file=out_pdf,
-                    output_file=out_pdf,
-                    watermark_image=watermark_image,
-                    watermark_type=watermark_type,
-                    horizontal_boxes=horizontal_boxes,
-                    vertical_boxes=vertical_boxes,
-                    angle=angle,
-                    opacity=opacity,
-                    image_scale=image_scale,
-                )
-            if watermark_success:
-                ok += 1
-    print("=" * 50)
-    print(t('md_conversion_completed', success=ok, total=len(md_files)))
+        if not force and stamps.get(out_pdf.name) == digest and _is_up_to_date(md, out_pdf):
+            print("✓ " + t('process.skipped_up_to_date', file=md.name))
+        else:
+            jobs.append((md, out_pdf))
+    # Skipped files count as successful
+    ok = len(md_files) - len(jobs)
+    _forget_stamps(stamp, stamps, [out_pdf.name for _, out_pdf in jobs])
+    if watermark_image:
+        # Watermark straight from the rendered bytes (image watermark only), so the
+        # unwatermarked PDF is never written and read back
+        def _sink(md_path: Path, out_pdf: Path, pdf_data: bytes) -> bool:
+            return _watermark_converted_pdf(md_path, out_pdf, pdf_data, watermark_image, config)
+
+        converted = _convert_batch(jobs, _sink, max_workers)
+    else:
+        converted = _convert_batch(jobs, max_workers=max_workers)
+    ok += len(converted)
+    _record_stamps(stamp, stamps, [out_pdf.name for out_pdf in converted], digest)
+    sys.stdout.write(f"{_SEP}\n{t('process.md_conversion_completed', success=ok, total=len(md_files))}\n")
     return ok == len(md_files)
 
 
 # watermark image setup moved to watermark.image_setup
 
 
-def _process_pdf_files(input_dir: str, output_dir: str, watermark_image: str, config: dict) -> bool:
+def _process_pdf_files(
+    input_dir: str,
+    output_dir: str,
+    watermark_image: str,
+    config: dict,
+    files: Optional[List[Path]] = None,
+) -> bool:
     """
     Process PDF files and add watermark.
     
@@ -565,30 +1454,40 @@ def _process_pdf_files(input_dir: str, output_dir: str, watermark_image: str, co
         output_dir: Output directory path
         watermark_image: Watermark image path
         config: User configuration dictionary
+        files: Already scanned PDF files, if any
         
     Returns:
         bool: True on success, else False
     """
     if not check_watermark_tool():
-        print("✗ " + t('watermark_cli_not_found'))
-        print(t('install_pdf_watermark_hint'))
+        print("✗ " + t('errors.watermark_cli_not_found'))
+        print(t('errors.install_pdf_watermark_hint'))
         return False
     
-    print(t('watermark_cli_available'))
+    print(t('errors.watermark_cli_available'))
     return process_all_pdfs(
         input_dir=input_dir,
         output_dir=output_dir,
         watermark_image=watermark_image,
-        watermark_type=config.get("watermark_type", WatermarkConfig.WATERMARK_TYPE),
-        horizontal_boxes=config.get("horizontal_boxes", WatermarkConfig.HORIZONTAL_BOXES),
-        vertical_boxes=config.get("vertical_boxes", WatermarkConfig.VERTICAL_BOXES),
-        angle=config.get("angle", WatermarkConfig.ANGLE),
-        opacity=config.get("opacity", WatermarkConfig.OPACITY),
-        image_scale=config.get("image_scale", WatermarkConfig.IMAGE_SCALE),
+        watermark_type=config.get("watermark_type", CONFIG.watermark_type),
+        horizontal_boxes=config.get("horizontal_boxes", CONFIG.horizontal_boxes),
+        vertical_boxes=config.get("vertical_boxes", CONFIG.vertical_boxes),
+        angle=config.get("angle", CONFIG.angle),
+        opacity=config.get("opacity", CONFIG.opacity),
+        image_scale=config.get("image_scale", CONFIG.image_scale),
+        files=files,
+        max_workers=config.get("jobs"),
+        force=config.get("force", False),
     )
 
 
-def _process_markdown_files(input_dir: str, output_dir: str, watermark_image: str, config: dict) -> bool:
+def _process_markdown_files(
+    input_dir: str,
+    output_dir: str,
+    watermark_image: str,
+    config: dict,
+    files: Optional[List[Path]] = None,
+) -> bool:
     """
     Convert Markdown files to PDF and add watermark.
     
@@ -597,88 +1496,125 @@ def _process_markdown_files(input_dir: str, output_dir: str, watermark_image: st
         output_dir: Output directory path
         watermark_image: Watermark image path
         config: User configuration dictionary
+        files: Already scanned Markdown files, if any
         
     Returns:
         bool: True on success, else False
     """
-    print(t('no_pdf_found_processing_md'))
+    print(t('process.no_pdf_found_processing_md'))
     return process_all_mds(
         input_dir=input_dir,
         output_dir=output_dir,
         watermark_image=watermark_image,
         config=config,
+        files=files,
+        max_workers=config.get("jobs"),
+        force=config.get("force", False),
     )
 
 
-def _process_markdown_files_no_watermark(input_dir: str, output_dir: str, config: dict) -> bool:
+def _process_markdown_files_no_watermark(
+    input_dir: str,
+    output_dir: str,
+    config: dict,
+    files: Optional[List[Path]] = None,
+) -> bool:
     """
     Convert Markdown files to PDF (no watermark).
     """
-    print(t('start_converting_md_no_watermark'))
-    return process_all_mds(input_dir=input_dir, output_dir=output_dir, watermark_image=None, config=config)
+    print(t('process.start_converting_md_no_watermark'))
+    return process_all_mds(input_dir=input_dir, output_dir=output_dir, watermark_image=None, config=config, files=files,
+                           max_workers=config.get("jobs"), force=config.get("force", False))
+
+
+# Default non-interactive configuration, built once at import; all values are immutable,
+# so a shallow copy per call is enough
+_DEFAULT_CONFIG_TEMPLATE = MappingProxyType({
+    "type": "text",
+    "text": "Watermark",
+    "add_date": True,
+    "font_size": CONFIG.font_size,
+    "text_color": CONFIG.text_color,
+    "padding": CONFIG.padding,
+    "watermark_type": CONFIG.watermark_type,
+    "opacity": CONFIG.opacity,
+    "angle": CONFIG.angle,
+    "image_scale": CONFIG.image_scale,
+    "horizontal_boxes": CONFIG.horizontal_boxes,
+    "vertical_boxes": CONFIG.vertical_boxes,
+    "input_dir": "input",
+    "output_dir": "output",
+    "verbose": False
+})
 
 
 def _build_default_config() -> dict:
     """Create the default non-interactive configuration dict."""
-    return {
-        "type": "text",
-        "text": "Watermark",
-        "add_date": True,
-        "font_size": WatermarkConfig.FONT_SIZE,
-        "text_color": WatermarkConfig.TEXT_COLOR,
-        "padding": WatermarkConfig.PADDING,
-        "watermark_type": WatermarkConfig.WATERMARK_TYPE,
-        "opacity": WatermarkConfig.OPACITY,
-        "angle": WatermarkConfig.ANGLE,
-        "image_scale": WatermarkConfig.IMAGE_SCALE,
-        "horizontal_boxes": WatermarkConfig.HORIZONTAL_BOXES,
-        "vertical_boxes": WatermarkConfig.VERTICAL_BOXES,
-        "input_dir": "input",
-        "output_dir": "output",
-        "verbose": False
-    }
+    return dict(_DEFAULT_CONFIG_TEMPLATE)
 
 
 # ---- New helpers to reduce main() complexity ----
 
+_USAGE = "Usage: python main.py [--interactive] [--lang en|zh] [--jobs N] [--force]"
+
+
+def _pop_cli_option(name: str) -> Optional[str]:
+    """
+    Remove an option and its value from sys.argv.
+    
+    Args:
+        name: Option name, e.g. "--jobs"
+        
+    Returns:
+        Optional[str]: The option value, or None if the option is absent
+    """
+    if name not in sys.argv:
+        return None
+    i = sys.argv.index(name)
+    value = sys.argv[i + 1] if i + 1 < len(sys.argv) else ""
+    del sys.argv[i:i + 2]
+    return value
+
+
+def _prompt_until_valid() -> dict:
+    """Run the interactive prompts until the user completes a configuration."""
+    # get_user_input returns None when the user backs out of a sub-menu; show it again
+    cfg = get_user_input()
+    while cfg is None:
+        cfg = get_user_input()
+    return cfg
+
+
 def _obtain_config_from_cli_and_env() -> dict:
     """Unify config acquisition based on CLI args and TTY."""
     if len(sys.argv) > 1:
         arg = sys.argv[1]
         if arg == "--interactive":
-            while True:
-                cfg = get_user_input()
-                if cfg is not None:
-                    return cfg
+            return _prompt_until_valid()
         if arg == "--lang" and len(sys.argv) > 2:
-            i18n.set_language(sys.argv[2])
-            print(f"Language set to: {i18n.get_current_language()}")
+            get_i18n().set_language(sys.argv[2])
+            print(f"Language set to: {get_i18n().get_current_language()}")
             if sys.stdin.isatty():
-                while True:
-                    cfg = get_user_input()
-                    if cfg is not None:
-                        return cfg
-            print(t('detected_non_interactive'))
-            print(t('hint_interactive_mode'))
+                return _prompt_until_valid()
+            print(t('errors.detected_non_interactive'))
+            print(t('errors.hint_interactive_mode'))
             return _build_default_config()
-        print("Usage: python main.py [--interactive] [--lang en|zh]")
+        print(_USAGE)
         sys.exit(1)
 
     if sys.stdin.isatty():
-        while True:
-            cfg = get_user_input()
-            if cfg is not None:
-                return cfg
-    print(t('detected_non_interactive'))
-    print(t('hint_interactive_mode'))
+        return _prompt_until_valid()
+    print(t('errors.detected_non_interactive'))
+    print(t('errors.hint_interactive_mode'))
     return _build_default_config()
 
 
 def _cleanup_generated_watermark(watermark_image: Optional[str], config: dict) -> None:
     """
-    Clean up generated watermark image file after processing.
-    Only deletes files in the watermarks/ directory that were generated from text.
-    Does not delete user-provided image watermarks.
+    Clean up generated watermark images after processing.
+    The watermark used by this run stays cached for the next run with the same settings;
+    cached ones unused for TEXT_WATERMARK_CACHE_MAX_AGE (e.g. earlier dates) are deleted.
+    Never touches user-provided image watermarks or images kept by watermark_only mode.
     
     Args:
         watermark_image: Path to the watermark image file
@@ -687,100 +1623,139 @@ def _cleanup_generated_watermark(watermark_image: Optional[str], config: dict) -
     if not watermark_image:
         return
     
-    watermark_path = Path(watermark_image)
-    
-    # Only delete if:
-    # 1. The file exists
-    # 2. It's in the watermarks/ directory
-    # 3. It was generated from text (not a user-provided image)
-    if watermark_path.exists() and watermark_path.parent.name == "watermarks":
-        # Check if this is a generated text watermark (not user-provided image)
-        if config.get("type") == "text" or (config.get("type") != "image" and not config.get("image")):
-            try:
-                watermark_path.unlink()
-                print(f"✓ Cleaned up generated watermark: {watermark_image}")
-            except Exception as e:
-                print(f"⚠ Warning: Failed to delete watermark file {watermark_image}: {e}")
+    # Only when it's in the generated-watermark cache (cheap string check first) ...
+    if os.path.dirname(watermark_image) != TEXT_WATERMARK_CACHE_DIR:
+        return
+    # ... and it was generated from text (not a user-provided image)
+    if not (config.get("type") == "text" or (config.get("type") != "image" and not config.get("image"))):
+        return
+    try:
+        for path in prune_text_watermark_cache():
+            print(f"✓ Cleaned up generated watermark: {path}")
+    except Exception as e:
+        print(f"⚠ Warning: Failed to clean up generated watermarks: {e}")
+
+
+def _print_banner(*lines: str) -> None:
+    """Print a blank line, a separator and the given lines with a single write."""
+    sys.stdout.write("\n".join(("", _SEP) + lines) + "\n")
+
+
+def _run_watermark_only(config: dict) -> int:
+    """Generate the watermark image and keep it; no files are processed."""
+    _print_banner(t('process.start_generating_watermark'))
+    watermark_image = _setup_watermark_image(config, keep=True)
+    if not watermark_image:
+        print("✗ " + t('errors.watermark_image_not_found'))
+        return 1
+    sys.stdout.write(f"{t('process.watermark_image_generated')} {watermark_image}\n{t('process.watermark_generation_completed')}\n")
+    # Don't clean up in watermark_only mode - user wants to keep it
+    return 0
+
+
+def _run_markdown_no_watermark(config: dict) -> int:
+    """Convert Markdown files to PDF without a watermark."""
+    _print_banner(t('process.start_converting_md_no_watermark'))
+    success = _process_markdown_files_no_watermark(config["input_dir"], config["output_dir"], config)
+    return int(not success)
+
+
+def _watermark_pdf_mode(input_dir: str, output_dir: str, watermark_image: str, config: dict) -> bool:
+    """Watermark PDFs, falling back to Markdown conversion when there are none."""
+    # One directory pass serves both the PDF check and the Markdown fallback
+    pdf_files, md_files = _scan_inputs(Path(input_dir))
+    if pdf_files:
+        return _process_pdf_files(input_dir, output_dir, watermark_image, config, files=pdf_files)
+    # No PDF files found, automatically fallback to Markdown processing
+    if md_files:
+        print(t('process.no_pdf_found_processing_md'))
+        return _process_markdown_files(input_dir, output_dir, watermark_image, config, files=md_files)
+    print("✗ " + t('errors.no_pdf_files_in_directory', directory=input_dir))
+    print("✗ " + t('errors.no_md_files_in_directory', directory=input_dir))
+    return False
+
+
+def _watermark_markdown_mode(input_dir: str, output_dir: str, watermark_image: str, config: dict) -> bool:
+    """Convert Markdown files to PDF and watermark them."""
+    return _process_markdown_files(input_dir, output_dir, watermark_image, config)
+
+
+def _watermark_auto_mode(input_dir: str, output_dir: str, watermark_image: str, config: dict) -> bool:
+    """Watermark PDFs if there are any, otherwise convert and watermark Markdown files."""
+    pdf_files, md_files = _scan_inputs(Path(input_dir))
+    if pdf_files:
+        return _process_pdf_files(input_dir, output_dir, watermark_image, config, files=pdf_files)
+    return _process_markdown_files(input_dir, output_dir, watermark_image, config, files=md_files)
+
+
+# Modes that don't need a (cleaned-up) watermark image set up by the dispatcher
+_MODE_HANDLERS = {
+    "watermark_only": _run_watermark_only,
+    "markdown_no_watermark": _run_markdown_no_watermark,
+}
+# Watermarking modes; any other mode value auto-detects the input type
+_WATERMARK_MODE_HANDLERS = {
+    "pdf": _watermark_pdf_mode,
+    "markdown": _watermark_markdown_mode,
+}
 
 
 def _dispatch_by_mode(config: dict) -> int:
     """Process files according to selected mode."""
-    watermark_image: Optional[str] = None
-    is_watermark_only_mode = config.get("mode") == "watermark_only"
+    mode = config.get("mode")
     
     try:
-        if is_watermark_only_mode:
-            print()
-            print("=" * 50)
-            print(t('start_generating_watermark'))
-            watermark_image = _setup_watermark_image(config)
-            if not watermark_image:
-                print("✗ " + t('watermark_image_not_found'))
-                return 1
-            print(f"{t('watermark_image_generated')} {watermark_image}")
-            print(t('watermark_generation_completed'))
-            # Don't clean up in watermark_only mode - user wants to keep it
-            return 0
-
-        if config.get("mode") == "markdown_no_watermark":
-            print()
-            print("=" * 50)
-            print(t('start_converting_md_no_watermark'))
-            return 0 if _process_markdown_files_no_watermark(config["input_dir"], config["output_dir"], config) else 1
+        handler = _MODE_HANDLERS.get(mode)
+        if handler is not None:
+            return handler(config)
 
         input_dir = config["input_dir"]
         output_dir = config["output_dir"]
 
-        watermark_image = _setup_watermark_image(config)
-        if not watermark_image:
-            print("✗ " + t('watermark_image_not_found'))
-            return 1
-
-        print()
-        print("=" * 50)
-        print(t('start_processing_files'))
-        print(f"{t('watermark_type')}: {config.get('watermark_type', WatermarkConfig.WATERMARK_TYPE)}")
-        if config.get("verbose", False):
-            print(f"{t('input_directory')}: {input_dir}")
-            print(f"{t('output_directory')}: {output_dir}")
-            print(f"{t('watermark_image')}: {watermark_image}")
-
-        if config.get("mode") == "pdf":
-            pdf_files_present = len(get_pdf_files(Path(input_dir))) > 0
-            if pdf_files_present:
-                success = _process_pdf_files(input_dir, output_dir, watermark_image, config)
-            else:
-                # No PDF files found, automatically fallback to Markdown processing
-                md_files_present = len(get_md_files(Path(input_dir))) > 0
-                if md_files_present:
-                    print(t('no_pdf_found_processing_md'))
-                    success = _process_markdown_files(input_dir, output_dir, watermark_image, config)
-                else:
-                    print("✗ " + t('no_pdf_files_in_directory', directory=input_dir))
-                    print("✗ " + t('no_md_files_in_directory', directory=input_dir))
-                    success = False
-        elif config.get("mode") == "markdown":
-            success = _process_markdown_files(input_dir, output_dir, watermark_image, config)
-        else:
-            pdf_files_present = len(get_pdf_files(Path(input_dir))) > 0
-            success = _process_pdf_files(input_dir, output_dir, watermark_image, config) if pdf_files_present else _process_markdown_files(input_dir, output_dir, watermark_image, config)
-
-        # Clean up generated watermark after processing (except in watermark_only mode)
-        if watermark_image and not is_watermark_only_mode:
-            _cleanup_generated_watermark(watermark_image, config)
-        
-        return 0 if success else 1
-    except Exception as e:
-        # Ensure cleanup even if there's an error (except in watermark_only mode)
-        if watermark_image and not is_watermark_only_mode:
-            _cleanup_generated_watermark(watermark_image, config)
+        with contextlib.ExitStack() as stack:
+            watermark_image = _setup_watermark_image(config)
+            if not watermark_image:
+                print("✗ " + t('errors.watermark_image_not_found'))
+                return 1
+            # Clean up stale generated watermarks however processing ends
+            # (watermark_only mode, which keeps them, returned above)
+            stack.callback(_cleanup_generated_watermark, watermark_image, config)
+
+            banner = [
+                t('process.start_processing_files'),
+                f"{t('config.watermark_type')}: {config.get('watermark_type', CONFIG.watermark_type)}",
+            ]
+            if config.get("verbose", False):
+                banner += [
+                    f"{t('process.input_directory')}: {input_dir}",
+                    f"{t('process.output_directory')}: {output_dir}",
+                    f"{t('process.watermark_image')}: {watermark_image}",
+                ]
+            _print_banner(*banner)
+
+            process = _WATERMARK_MODE_HANDLERS.get(mode, _watermark_auto_mode)
+            success = process(input_dir, output_dir, watermark_image, config)
+        return int(not success)
+    except (OSError, ValueError) as e:
         print(f"✗ Error during processing: {e}")
         return 1
 
 
 def main():
     """Main function with simplified structure: acquire config, then dispatch by mode."""
+    # Options that may appear anywhere are taken out before the positional handling
+    jobs = _pop_cli_option("--jobs")
+    force = "--force" in sys.argv
+    if force:
+        sys.argv.remove("--force")
+    if jobs is not None and not (jobs.isdigit() and int(jobs) > 0):
+        print(_USAGE)
+        sys.exit(1)
     config = _obtain_config_from_cli_and_env()
+    if jobs is not None:
+        config["jobs"] = int(jobs)
+    if force:
+        config["force"] = True
     return _dispatch_by_mode(config)
 
 
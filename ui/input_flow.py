@@ -6,20 +6,20 @@ import os
 from typing import Optional, Dict, Any
 
 from i18n import t
-from config import WatermarkConfig
+from config import CONFIG
 
 
 def _prompt_mode() -> Dict[str, Any]:
-    print(t('operation_mode_title'))
-    print(f"   [1] {t('process_pdf_with_watermark')}")
-    print(f"   [2] {t('convert_md_to_pdf_with_watermark')}")
-    print(f"   [3] {t('generate_watermark_only')}")
-    print(f"   [4] {t('convert_md_to_pdf_no_watermark')}")
-    print(f"   [0] {t('exit_program')}")
+    print(t('menu.operation_mode_title'))
+    print(f"   [1] {t('menu.process_pdf_with_watermark')}")
+    print(f"   [2] {t('menu.convert_md_to_pdf_with_watermark')}")
+    print(f"   [3] {t('menu.generate_watermark_only')}")
+    print(f"   [4] {t('menu.convert_md_to_pdf_no_watermark')}")
+    print(f"   [0] {t('menu.exit_program')}")
     while True:
-        choice = input(t('invalid_choice') + " 0-4: ").strip()
+        choice = input(t('menu.invalid_choice') + " 0-4: ").strip()
         if choice == "0":
-            print(t('program_exited'))
+            print(t('errors.program_exited'))
             exit(0)
         if choice == "1":
             return {"mode": "pdf"}
@@ -29,80 +29,80 @@ def _prompt_mode() -> Dict[str, Any]:
             return {"mode": "watermark_only"}
         if choice == "4":
             return {"mode": "markdown_no_watermark"}
-        print(t('invalid_choice') + " 0-4")
+        print(t('menu.invalid_choice') + " 0-4")
 
 
 def _prompt_watermark_type() -> str:
     print()
-    print(t('watermark_type_title'))
-    print(f"   [1] {t('text_watermark_recommended')}")
-    print(f"   [2] {t('image_watermark')}")
-    print(f"   [0] {t('back_to_previous')}")
+    print(t('menu.watermark_type_title'))
+    print(f"   [1] {t('menu.text_watermark_recommended')}")
+    print(f"   [2] {t('menu.image_watermark')}")
+    print(f"   [0] {t('menu.back_to_previous')}")
     while True:
-        choice = input(t('invalid_choice') + " 0-2: ").strip()
+        choice = input(t('menu.invalid_choice') + " 0-2: ").strip()
         if choice == "0":
             return "back"
         if choice == "1":
             return "text"
         if choice == "2":
             return "image"
-        print(t('invalid_choice') + " 0-2")
+        print(t('menu.invalid_choice') + " 0-2")
 
 
 def _prompt_text_config(config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     print()
-    print(t('text_watermark_config'))
-    print(f"   [0] {t('back_to_previous')}")
+    print(t('menu.text_watermark_config'))
+    print(f"   [0] {t('menu.back_to_previous')}")
     while True:
         red = "\033[31m"
         reset = "\033[0m"
-        prompt = f"\n{red}{t('enter_watermark_text')}{reset}\n> "
+        prompt = f"\n{red}{t('menu.enter_watermark_text')}{reset}\n> "
         text = input(prompt).strip()
         if text == "0":
             return None
         if text:
             config["text"] = text
             break
-        print(t('watermark_text_cannot_be_empty'))
+        print(t('menu.watermark_text_cannot_be_empty'))
     while True:
-        add_date = input(t('add_date_to_watermark')).strip().lower()
+        add_date = input(t('menu.add_date_to_watermark')).strip().lower()
         if add_date == "0":
             return None
         if add_date in ["", "y", "n"]:
             config["add_date"] = add_date != "n"
             break
-        print(t('enter_y_n_or_0'))
+        print(t('menu.enter_y_n_or_0'))
     return config
 
 
 def _prompt_image_config(config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     print()
-    print(t('image_watermark_config'))
-    print(f"   [0] {t('back_to_previous')}")
+    print(t('menu.image_watermark_config'))
+    print(f"   [0] {t('menu.back_to_previous')}")
     while True:
-        image_path = input(t('enter_watermark_image_path')).strip()
+        image_path = input(t('menu.enter_watermark_image_path')).strip()
         if image_path == "0":
             return None
         if image_path and os.path.exists(image_path):
             config["image"] = image_path
             return config
         if image_path:
-            print(t('image_file_not_found') + f": {image_path}")
+            print(t('menu.image_file_not_found') + f": {image_path}")
         else:
-            print(t('image_path_cannot_be_empty'))
+            print(t('menu.image_path_cannot_be_empty'))
 
 
 def _apply_defaults(config: Dict[str, Any]) -> Dict[str, Any]:
     config.update({
-        "font_size": WatermarkConfig.FONT_SIZE,
-        "text_color": WatermarkConfig.TEXT_COLOR,
-        "padding": WatermarkConfig.PADDING,
-        "watermark_type": WatermarkConfig.WATERMARK_TYPE,
-        "opacity": WatermarkConfig.OPACITY,
-        "angle": WatermarkConfig.ANGLE,
-        "image_scale": WatermarkConfig.IMAGE_SCALE,
-        "horizontal_boxes": WatermarkConfig.HORIZONTAL_BOXES,
-        "vertical_boxes": WatermarkConfig.VERTICAL_BOXES,
+        "font_size": CONFIG.font_size,
+        "text_color": CONFIG.text_color,
+        "padding": CONFIG.padding,
+        "watermark_type": CONFIG.watermark_type,
+        "opacity": CONFIG.opacity,
+        "angle": CONFIG.angle,
+        "image_scale": CONFIG.image_scale,
+        "horizontal_boxes": CONFIG.horizontal_boxes,
+        "vertical_boxes": CONFIG.vertical_boxes,
         "input_dir": "input",
         "output_dir": "output",
         "verbose": False
@@ -118,9 +118,9 @@ def get_user_input() -> Optional[Dict[str, Any]]:
         dict: User configuration dictionary or None to go back.
     """
     while True:
-        print(t('app_title'))
+        print(t('menu.app_title'))
         print("=" * 50)
-        print(t('select_operation_mode'))
+        print(t('menu.select_operation_mode'))
         print()
 
         config: Dict[str, Any] = {}
@@ -2,13 +2,26 @@
 Utilities for watermark image discovery, generation, and setup.
 """
 
+import functools
+import hashlib
+import io
 import os
+import re
+import tempfile
+import time
 from pathlib import Path
 from typing import List, Optional
 from datetime import date, datetime
 
 from i18n import t
-from config import WatermarkConfig
+from config import CONFIG
+
+
+_WATERMARK_IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".svg")
+# Generated text watermarks; kept apart from user images so find_watermark_image never picks them
+TEXT_WATERMARK_CACHE_DIR = os.path.join("watermarks", ".cache")
+# Cached watermarks unused for this long are pruned; each cache hit refreshes the mtime
+TEXT_WATERMARK_CACHE_MAX_AGE = 7 * 24 * 3600
 
 
 def find_watermark_image() -> Optional[str]:
@@ -18,14 +31,24 @@ def find_watermark_image() -> Optional[str]:
     Returns:
         Optional[str]: First image file path found, or None if not found
     """
-    candidates: List[str] = []
-    base = Path("watermarks")
-    if not base.exists():
+    best: Optional[str] = None
+    best_rank = len(_WATERMARK_IMAGE_EXTS)
+    try:
+        # One directory pass instead of a glob per extension
+        with os.scandir("watermarks") as entries:
+            for e in entries:
+                ext = os.path.splitext(e.name)[1].lower()
+                if ext not in _WATERMARK_IMAGE_EXTS or not e.is_file():
+                    continue
+                # PNG first, then JPEG, then SVG; nothing beats a PNG, so stop at the first one
+                rank = _WATERMARK_IMAGE_EXTS.index(ext)
+                if rank == 0:
+                    return e.path
+                if rank < best_rank:
+                    best, best_rank = e.path, rank
+    except OSError:
         return None
-    exts = ["*.png", "*.PNG", "*.jpg", "*.jpeg", "*.svg"]
-    for ext in exts:
-        candidates.extend([str(p) for p in base.glob(ext)])
-    return candidates[0] if candidates else None
+    return best
 
 
 def get_today_str() -> str:
@@ -83,8 +106,9 @@ def _search_windows_fonts() -> Optional[str]:
     return None
 
 
+@functools.lru_cache(maxsize=1)
 def _find_chinese_font_path() -> Optional[str]:
-    """Look for a CJK font via env var and common paths."""
+    """Look for a CJK font via env var and common paths (resolved once per run)."""
     # 1) Environment variable first
     env_font = os.environ.get("WATERMARK_FONT")
     if env_font and os.path.exists(env_font):
@@ -99,54 +123,73 @@ def _find_chinese_font_path() -> Optional[str]:
     return _search_windows_fonts()
 
 
+@functools.lru_cache(maxsize=8)
+def _load_font(font_path: str, font_size: int):
+    """Open a TrueType font once per (path, size); parsing CJK font files is expensive."""
+    from PIL import ImageFont  # type: ignore
+
+    return ImageFont.truetype(font_path, font_size)
+
+
+@functools.lru_cache(maxsize=8)
+def _render_text_png(text: str, font_path: str, font_size: int, color: tuple, padding: int) -> bytes:
+    """Render text to transparent PNG bytes, memoized so repeated setups skip Pillow."""
+    from PIL import Image, ImageDraw  # type: ignore
+
+    font = _load_font(font_path, font_size)
+    # Measure with the font itself; no throwaway image needed
+    left, top, right, bottom = font.getbbox(text)
+    img = Image.new("RGBA", (right - left + padding * 2, bottom - top + padding * 2), (0, 0, 0, 0))
+    ImageDraw.Draw(img).text((padding, padding), text, font=font, fill=color)
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
 def generate_text_watermark_image(text: str, out_path: str, font_size: int = 48, color=(68, 68, 68, 220), padding: int = 20) -> Optional[str]:
     """
     Render text to a transparent PNG image and return the generated path.
     """
     try:
-        from PIL import Image, ImageDraw, ImageFont  # type: ignore
+        import PIL  # type: ignore  # noqa: F401  (availability check; used by _render_text_png)
     except Exception:
-        print("✗ " + t('missing_dependency_pillow'))
+        print("✗ " + t('errors.missing_dependency_pillow'))
         return None
 
     font_path = _find_chinese_font_path()
     if not font_path:
-        print("✗ " + t('chinese_font_not_found'))
+        print("✗ " + t('errors.chinese_font_not_found'))
         return None
 
     try:
-        font = ImageFont.truetype(font_path, font_size)
+        png_data = _render_text_png(text, font_path, font_size, tuple(color), padding)
     except Exception as e:
-        print("✗ " + t('open_font_failed', font=font_path, error=str(e)))
+        print("✗ " + t('errors.open_font_failed', font=font_path, error=str(e)))
         return None
 
-    # Measure text size first
-    dummy = Image.new("RGBA", (1, 1))
-    draw = ImageDraw.Draw(dummy)
-    bbox = draw.textbbox((0, 0), text, font=font)
-    text_w = bbox[2] - bbox[0]
-    text_h = bbox[3] - bbox[1]
+    out_dir = Path(out_path).parent
+    out_dir.mkdir(parents=True, exist_ok=True)
+    # Write atomically: cached images are reused by path, so a run killed mid-write
+    # must not leave a truncated PNG behind under the final name
+    with tempfile.NamedTemporaryFile(dir=out_dir, suffix=".part", delete=False) as tmp:
+        tmp.write(png_data)
+    try:
+        os.replace(tmp.name, out_path)
+    except OSError:
+        os.unlink(tmp.name)
+        raise
+    print(t('errors.text_watermark_image_generated', path=out_path, font=font_path))
+    return out_path
 
-    img = Image.new("RGBA", (text_w + padding * 2, text_h + padding * 2), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    draw.text((padding, padding), text, font=font, fill=color)
 
-    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
-    img.save(out_path)
-    print(t('text_watermark_image_generated', path=out_path, font=font_path))
-    return out_path
+# \w is Unicode-aware, so CJK watermark text stays readable in file names
+_UNSAFE_FILENAME_RE = re.compile(r"[^\w\- ]")
+_SPACES_RE = re.compile(r" +")
 
 
 def _sanitize_filename(value: str) -> str:
-    safe = []
-    for ch in value:
-        if ch.isalnum() or ch in ['_', '-', ' ']:
-            safe.append(ch)
-        else:
-            safe.append('_')
-    name = ''.join(safe).strip()
-    name = '_'.join(name.split())
-    return name[:80] if len(name) > 80 else name
+    name = _UNSAFE_FILENAME_RE.sub('_', value).strip()
+    return _SPACES_RE.sub('_', name)[:80]
 
 
 # ---- New small helpers to simplify setup ----
@@ -156,7 +199,7 @@ def _image_from_config(config: dict) -> Optional[str]:
     if config.get("type") == "image" and image:
         if os.path.exists(image):
             return image
-        print("✗ " + t('image_file_not_found') + f": {image}")
+        print("✗ " + t('menu.image_file_not_found') + f": {image}")
     return None
 
 
@@ -176,21 +219,74 @@ def _output_path_for_text_config(config: dict) -> str:
     return str(out_dir / f"{base_text_for_filename}_{timestamp}.png")
 
 
-def _generate_text_or_fallback(watermark_text: str, config: dict) -> Optional[str]:
-    out_path = _output_path_for_text_config(config)
+def _cache_path_for_text_config(config: dict, watermark_text: str) -> str:
+    # Content-addressed: the same text, style and font always map to the same file
+    base_text_for_filename = _sanitize_filename(config.get("text", "watermark")) or "watermark"
+    key = hashlib.blake2b(repr((
+        watermark_text,
+        config.get("font_size", CONFIG.font_size),
+        tuple(config.get("text_color", CONFIG.text_color)),
+        config.get("padding", CONFIG.padding),
+        _find_chinese_font_path(),
+    )).encode(), digest_size=8).hexdigest()
+    return str(Path(TEXT_WATERMARK_CACHE_DIR) / f"{base_text_for_filename}_{key}.png")
+
+
+def _generate_text_or_fallback(watermark_text: str, config: dict, keep: bool = False) -> Optional[str]:
+    if keep:
+        out_path = _output_path_for_text_config(config)
+    else:
+        out_path = _cache_path_for_text_config(config, watermark_text)
+        try:
+            # Generated by an earlier run with identical settings; mark it as recently used
+            os.utime(out_path)
+            return out_path
+        except OSError:
+            pass
     generated = generate_text_watermark_image(
         watermark_text,
         out_path,
-        font_size=config.get("font_size", WatermarkConfig.FONT_SIZE),
-        color=config.get("text_color", WatermarkConfig.TEXT_COLOR),
-        padding=config.get("padding", WatermarkConfig.PADDING)
+        font_size=config.get("font_size", CONFIG.font_size),
+        color=config.get("text_color", CONFIG.text_color),
+        padding=config.get("padding", CONFIG.padding)
     )
     return generated or find_watermark_image()
 
 
-def _setup_watermark_image(config: dict) -> Optional[str]:
+def prune_text_watermark_cache(max_age: float = TEXT_WATERMARK_CACHE_MAX_AGE) -> List[str]:
+    """
+    Delete cached text watermarks that no run has used for max_age seconds (e.g. older dates).
+    
+    Args:
+        max_age: Age in seconds, by modification time, after which an entry is stale
+        
+    Returns:
+        List[str]: Paths that were deleted
+    """
+    removed = []
+    cutoff = time.time() - max_age
+    try:
+        with os.scandir(TEXT_WATERMARK_CACHE_DIR) as entries:
+            # .part files are leftovers of runs killed while writing an image
+            stale = [e.path for e in entries if e.name.endswith((".png", ".part")) and e.is_file()
+                     and e.stat().st_mtime < cutoff]
+    except OSError:
+        return removed
+    for path in stale:
+        try:
+            os.unlink(path)
+            removed.append(path)
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+def _setup_watermark_image(config: dict, keep: bool = False) -> Optional[str]:
     """
     Set up the watermark image, preferring generation from text.
+    
+    Text watermarks come from the cache in TEXT_WATERMARK_CACHE_DIR; with keep=True a
+    fresh image is written to watermarks/ for the user instead.
     """
     image = _image_from_config(config)
     if image:
@@ -198,7 +294,7 @@ def _setup_watermark_image(config: dict) -> Optional[str]:
 
     watermark_text = _watermark_text_from_config(config)
     if watermark_text:
-        return _generate_text_or_fallback(watermark_text, config)
+        return _generate_text_or_fallback(watermark_text, config, keep)
 
     return find_watermark_image()
 